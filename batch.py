@@ -0,0 +1,390 @@
+import os
+import sys
+import glob
+import time
+import argparse
+import concurrent.futures
+
+import config_parser as mcp
+from resultcache import ResultCache
+from outputstore import OutputStore
+from verbose import VerboseMessage as v
+
+# header DB shared by every file a worker process handles, set by init_worker()
+worker_db = None
+# output store of the run or None, set by init_worker()
+worker_store = None
+
+def init_worker(db, level, engine, store=None):
+    """Prepare one worker process for batch processing.
+
+    Input:
+        db: Header database loaded once by the parent, or None.
+        level: Verbose level for messages logged while processing files.
+        engine: XcfgCalculateCRC.CRC_ENGINE_* selector.
+        store: Output store directory, or None.
+    Output:
+        None. Sets process-wide state used by process_file().
+    """
+    global worker_db, worker_store
+
+    worker_db = db
+    worker_store = OutputStore(store) if store else None
+    v.set(level)
+    mcp.XcfgCalculateCRC.engine = engine
+    mcp.XcfgBuildRawFile.interactive = False
+
+def process_file(path, output=None, raw=False, stream=False, image=None, in_place=False):
+    """Load one xcfg, verify its CRC and write the rebuilt xcfg/raw/image files.
+
+    Input:
+        path: xcfg file path.
+        output: CLI output selector or None.
+        raw: Whether to generate a raw file as well.
+        stream: Whether to parse the xcfg in stream mode.
+        image: Image formats ('bin', 'hex') to generate as well, or None.
+        in_place: Whether to patch the checksum into the xcfg itself.
+    Output:
+        Result dictionary with path, file_crc, calculated_crc, file_version, outputs and error.
+        With an output store, outputs are store objects and 'names' holds the
+        generated names for the parent to index.
+    """
+    result = {'path': path, 'file_crc': None, 'calculated_crc': None, 'file_version': None, 'outputs': [], 'error': None}
+    folder = worker_store.stage_dir() if worker_store is not None else None
+    base = worker_store.staging_path(path, folder) if folder is not None else None
+    # (name, store object or None when the file was written by a saver)
+    written = []
+    try:
+        xcfg = mcp.XcfgConfigParser()
+        xcfg.load(path, stream=stream)
+        result['file_crc'] = xcfg.config_crc()
+        result['calculated_crc'] = xcfg.calculated_crc()
+        result['file_version'] = xcfg.get_ext('file_version')
+
+        if worker_store is not None and not (stream or in_place):
+            written.append(worker_store.add_xcfg(xcfg, output, base))
+        else:
+            written.append((xcfg.save(output, base, in_place=in_place), None))
+
+        images = image or []
+        builder = mcp.XcfgBuildRawFile(xcfg)
+        if raw or 'bin' in images:
+            builder.load_db(worker_db)
+            builder.rebuild_raw_data(output)
+
+        if raw:
+            if worker_store is not None:
+                written.append(worker_store.add_raw(builder, output, base))
+            else:
+                written.append((builder.save_raw_file(output, base), None))
+        for x in images:
+            written.append((builder.save_image_file(x, output, base), None))
+    except Exception as e:
+        result['error'] = str(e)
+
+    # files written before an error are reported (and stored) as well
+    written = [x for x in written if x and x[0]]
+    if worker_store is not None:
+        try:
+            written = [(name, target or (worker_store.add(name) if worker_store.staged(name) else name))
+                       for name, target in written]
+        except Exception as e:
+            result['error'] = result['error'] or str(e)
+            written = []
+        finally:
+            worker_store.discard(folder)
+        result['names'] = [name for name, _ in written]
+        result['outputs'].extend(target for _, target in written)
+    else:
+        result['outputs'].extend(name for name, _ in written)
+
+    return result
+
+def verify_file(path):
+    """Verify the config CRC of one raw file against its stored CHECKSUM.
+
+    Input:
+        path: Raw file path.
+    Output:
+        Result dictionary shaped like process_file(), without outputs.
+    """
+    result = {'path': path, 'file_crc': None, 'calculated_crc': None, 'file_version': None, 'outputs': [], 'error': None}
+    try:
+        result['file_crc'], result['calculated_crc'] = mcp.verify_raw(path)
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+def process_task(task):
+    """Unpack a (path, output, raw, stream, image, in_place) task for Executor.map."""
+    return process_file(*task)
+
+def collect_files(patterns, ext='xcfg', rebuilt=False):
+    """Expand directories and glob patterns into a sorted, de-duplicated file list.
+
+    Input:
+        patterns: Directories, files or glob patterns ('**' recurses).
+        ext: File extension to pick up from directories and patterns.
+        rebuilt: Whether to keep files generated by earlier runs ('*.rebuild(*').
+    Output:
+        List of file paths.
+    """
+    files = []
+    seen = set()
+
+    def add(path):
+        name = os.path.basename(path)
+        if name.rsplit('.', 1)[-1].lower() != ext or ('.rebuild(' in name and not rebuilt):
+            return
+
+        if path not in seen:
+            seen.add(path)
+            files.append(path)
+
+    for pattern in patterns:
+        hits = sorted(glob.glob(pattern, recursive=True))
+        if not hits:
+            v.msg(v.WARN, 'Un-exist file name \'{:s}\''.format(pattern))
+
+        for hit in hits:
+            if os.path.isdir(hit):
+                for root, dirs, names in os.walk(hit):
+                    dirs.sort()
+                    for name in sorted(names):
+                        add(os.path.join(root, name))
+            else:
+                add(hit)
+
+    return files
+
+def format_result(result):
+    """Format the one-line summary of a process_file() result."""
+    if result['error'] is not None:
+        status = 'ERROR'
+    elif result['calculated_crc'] is None:
+        status = 'NO-CRC'
+    elif result['calculated_crc'] == result['file_crc']:
+        status = 'MATCHED'
+    else:
+        status = 'MISMATCH'
+
+    def crc(val):
+        return '{:06X}'.format(val) if val is not None else '------'
+
+    line = '{:8s} {:s} file={:s} calc={:s}'.format(status, result['path'], crc(result['file_crc']), crc(result['calculated_crc']))
+    if result['outputs']:
+        line += ' -> ' + ', '.join(result['outputs'])
+    if result['error'] is not None:
+        line += ' ({:s})'.format(result['error'])
+    if result.get('cached'):
+        line += ' (cached)'
+
+    return status, line
+
+def batch(args=None):
+    """Run the CLI workflow for processing many xcfg files in one process pool.
+
+    Input:
+        args: Optional command-line argument list. When omitted, sys.argv[1:] is used.
+    Output:
+        Number of files with a mismatched CRC or an error.
+
+    Key steps:
+        1. Expand directories/globs into the xcfg file list, or the raw file
+           list with --verify-raw.
+        2. Answer unchanged files from the result cache.
+        3. Load the header database once, only when files are left to process.
+        4. Fan the remaining files out over a ProcessPoolExecutor and print one
+           line per file in order, storing new results in the cache.
+    """
+    parser = parse_args()
+    args = parser.parse_args(args)
+
+    v.set(args.verbose)
+
+    # raw files are verified as they are, rebuilt ones included
+    ext = 'raw' if args.verify_raw else 'xcfg'
+    files = collect_files(args.path, ext, rebuilt=args.verify_raw)
+    if not files:
+        v.msg(v.WARN, 'No {:s} file found'.format(ext))
+        return 0
+
+    jobs = args.jobs or os.cpu_count() or 1
+    t0 = time.perf_counter()
+
+    # --crc-check exists to run the engines, so it never answers from the cache
+    cache = None
+    keys = {}
+    cached = {}
+    if not args.no_cache and not args.crc_check and not args.verify_raw:
+        cache = ResultCache(args.cache, mcp.__version__)
+        for path in files:
+            keys[path] = cache.file_key(path, args.output, args.raw, args.database, args.image, args.in_place, args.store)
+            result = cache.get(keys[path], path)
+            if result is not None:
+                result.update(path=path, error=None, cached=True)
+                cached[path] = result
+
+    if args.verify_raw:
+        func = verify_file
+        tasks = files
+    else:
+        func = process_task
+        tasks = [(path, args.output, args.raw, args.stream, args.image, args.in_place) for path in files if path not in cached]
+
+    db = None
+    if tasks and (args.raw or args.image) and args.database and not args.verify_raw:
+        if os.path.exists(args.database):
+            # indexed once here, workers share it without pandas; an .xdb is mapped by each worker
+            db = mcp.load_header_db(args.database)
+        else:
+            v.msg(v.INFO, 'No use database')
+
+    engine = mcp.XcfgCalculateCRC.CRC_ENGINE_CHECK if args.crc_check else mcp.XcfgCalculateCRC.CRC_ENGINE_TABLE
+    # per-file messages only from INFO on, the summary lines carry the results
+    level = args.verbose if args.verbose >= v.INFO else -1
+    # the index is only written here, workers just add objects
+    store = OutputStore(args.store) if args.store and not args.verify_raw else None
+    initargs = (db, level, engine, store.root if store is not None else None)
+
+    counts = {}
+    if jobs == 1 or len(tasks) <= 1:
+        init_worker(*initargs)
+
+        def run():
+            for task in tasks:
+                v.set(level)
+                result = func(task)
+                v.set(args.verbose)
+                yield result
+
+        counts = report(files, cached, run(), counts, cache, keys, store)
+    else:
+        chunksize = max(1, len(tasks) // (jobs * 8))
+        with concurrent.futures.ProcessPoolExecutor(jobs, initializer=init_worker, initargs=initargs) as executor:
+            results = executor.map(func, tasks, chunksize=chunksize)
+            counts = report(files, cached, results, counts, cache, keys, store)
+
+    if store is not None:
+        store.save_index()
+
+    if cache is not None:
+        cache.close()
+
+    v.msg(v.CONST, 'Files: {:d}, matched: {:d}, mismatch: {:d}, no-crc: {:d}, error: {:d}, cached: {:d} ({:.2f}s, {:d} jobs)'.format(
+        len(files), counts.get('MATCHED', 0), counts.get('MISMATCH', 0), counts.get('NO-CRC', 0), counts.get('ERROR', 0),
+        len(cached), time.perf_counter() - t0, jobs))
+
+    return counts.get('MISMATCH', 0) + counts.get('ERROR', 0)
+
+def report(files, cached, results, counts, cache=None, keys=None, store=None):
+    """Print the summary line of each file in order and count the statuses.
+
+    Input:
+        files: All file paths in report order.
+        cached: Results answered from the cache, keyed by path.
+        results: Iterable of process_file() results for the other files, in order.
+        counts: Status counter dictionary to update.
+        cache: Optional ResultCache receiving the new matched/mismatched results.
+        keys: Cache keys by path.
+        store: Optional OutputStore indexing the stored outputs.
+    Output:
+        The updated status counter dictionary.
+    """
+    results = iter(results)
+    for path in files:
+        result = cached.get(path)
+        if result is None:
+            result = next(results)
+
+        if store is not None:
+            for name, target in zip(result.get('names', []), result['outputs']):
+                if name != target:
+                    store.record(path, name, target)
+
+        status, line = format_result(result)
+        counts[status] = counts.get(status, 0) + 1
+        v.msg(v.CONST, line)
+
+        if cache is not None and not result.get('cached') and status in ('MATCHED', 'MISMATCH'):
+            cache.put(keys[path], path, result)
+
+    return counts
+
+def parse_args():
+    """Build and return the command-line argument parser for batch runs."""
+
+    parser = argparse.ArgumentParser(
+        prog='Maxtouch Config batch calculator',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description='Verify and rebuild the CRC of many xcfg files in one run')
+
+    parser.add_argument('path', nargs='+',
+                        metavar='DIR|GLOB',
+                        help='xcfg (or raw) files, directories (searched recursively) or glob patterns')
+
+    parser.add_argument('-j', '--jobs', type=int,
+                        default=0,
+                        help='worker processes, 0 for one per CPU')
+
+    parser.add_argument('--stream', required=False,
+                        action='store_true',
+                        help='parse the xcfg lazily without keeping its text in memory')
+
+    parser.add_argument('--store', required=False,
+                        default='',
+                        metavar='DIR',
+                        help='save outputs into a content-addressed store, identical outputs are kept once')
+
+    parser.add_argument('--in-place', required=False,
+                        action='store_true',
+                        help='patch a mismatched checksum into each xcfg instead of saving rebuilt copies')
+
+    parser.add_argument('--verify-raw', required=False,
+                        action='store_true',
+                        help='verify the CRC of raw files instead of processing xcfg files')
+
+    parser.add_argument('-r', '--raw', required=False,
+                        action='store_true',
+                        help='whether save out a \'RAW\' file')
+
+    parser.add_argument('--image', required=False,
+                        action='append',
+                        choices=mcp.XcfgBuildRawFile.IMAGE_FORMATS,
+                        help='also save a packed binary (bin) or Intel-HEX (hex) image, may be repeated')
+
+    parser.add_argument('-db', '--database', required=False,
+                        nargs='?',
+                        default='db_header.csv',
+                        help='load chip Info Block database (CSV or binary .xdb), loaded once for all files')
+
+    parser.add_argument('-v', '--verbose',
+                        type=int,
+                        choices=range(5),
+                        default=1,
+                        help='set debug verbose level[0-5], per-file messages from level 2')
+
+    parser.add_argument('--crc-check', required=False,
+                        action='store_true',
+                        help='cross-check the table CRC engine against the reference algorithm')
+
+    parser.add_argument('-o', '--output',
+                        type=int,
+                        choices=(1,2),
+                        default=None,
+                        help='set the output format (same rules as runstat)')
+
+    parser.add_argument('--cache', required=False,
+                        default=ResultCache.DEFAULT_FILE,
+                        metavar='FILE',
+                        help='result cache keyed by xcfg content, unchanged files are not parsed again')
+
+    parser.add_argument('--no-cache', required=False,
+                        action='store_true',
+                        help='neither read nor update the result cache')
+
+    return parser
+
+if __name__ == "__main__":
+    batch(sys.argv[1:])
@@ -0,0 +1,158 @@
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+
+import config_parser as mcp
+from verbose import VerboseMessage as v
+
+class LegacyLineClassifier(object):
+    """Per-pattern line classifier as used before the combined lexer, kept as the baseline."""
+
+    def __init__(self):
+        """Borrow the tag/data pattern tables from XcfgConfigParser."""
+        self.tag_re_patterns = mcp.XcfgConfigParser.tag_re_patterns
+        self.dat_re_patterns = mcp.XcfgConfigParser.dat_re_patterns
+
+    def strip(self, line):
+        """Remove BOM characters one by one, then surrounding whitespace."""
+        for i, a in enumerate(line):
+            if a != '\ufeff':
+                break
+
+        return line[i:].strip()
+
+    def classify(self, line):
+        """Match header patterns, then data patterns, compiling each per call."""
+        raw = self.strip(line)
+        if raw.startswith('[') and raw.endswith(']'):
+            for tag, ptn in self.tag_re_patterns.items():
+                result = re.compile(ptn).match(raw)
+                if result:
+                    return tag, result
+
+        for tag, ptn in self.dat_re_patterns.items():
+            result = re.compile(ptn).match(raw)
+            if result:
+                return tag, result
+
+        return (None, None)
+
+def read_lines(path):
+    """Read and decode all lines of an xcfg file."""
+    with open(path, 'rb') as f:
+        return [line.decode('utf-8') for line in f]
+
+def timed(func, repeat):
+    """Return the best wall time of `repeat` calls to func."""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        dt = time.perf_counter() - t0
+        if best is None or dt < best:
+            best = dt
+
+    return best
+
+def bench_lexer(path, repeat=3):
+    """Compare per-line classification and load cost on one xcfg file.
+
+    Input:
+        path: xcfg file to benchmark.
+        repeat: Number of runs, the best run is reported.
+    Output:
+        None. Prints microseconds per line.
+    """
+    lines = read_lines(path)
+    n = max(len(lines), 1)
+
+    legacy = LegacyLineClassifier()
+    xcfg = mcp.XcfgConfigParser()
+
+    def run_legacy():
+        for line in lines:
+            legacy.classify(line)
+
+    def run_lexer():
+        for _ in xcfg.lex(lines):
+            pass
+
+    def run_load():
+        mcp.XcfgConfigParser().load(path)
+
+    level = v.v_level
+    v.set(-1)
+    try:
+        t_legacy = timed(run_legacy, repeat)
+        t_lexer = timed(run_lexer, repeat)
+        t_load = timed(run_load, repeat)
+    finally:
+        v.set(level)
+
+    print('{:s}: {:d} lines'.format(path, len(lines)))
+    print('  classify (legacy per-pattern): {:8.3f} us/line'.format(t_legacy / n * 1e6))
+    print('  classify (combined lexer):     {:8.3f} us/line'.format(t_lexer / n * 1e6))
+    print('  XcfgConfigParser.load:         {:8.3f} us/line ({:.3f}s)'.format(t_load / n * 1e6, t_load))
+
+def bench_startup(paths, repeat=3):
+    """Measure runstat start-up cost as seen by build scripts calling it per file.
+
+    Input:
+        paths: TXT files passed to `runstat -f`.
+        repeat: Number of runs, the best run is reported.
+    Output:
+        None. Prints milliseconds per process, with a bare interpreter as the floor.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    script = os.path.join(root, 'runstat.py')
+
+    cases = [('python -c pass', [sys.executable, '-c', 'pass']),
+             ('runstat --version', [sys.executable, script, '--version'])]
+    for path in paths:
+        cases.append(('runstat -f ' + path, [sys.executable, script, '-f', path]))
+
+    for name, cmd in cases:
+        t = timed(lambda: subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL), repeat)
+        print('  {:32s} {:8.1f} ms'.format(name, t * 1e3))
+
+    # heavy modules pulled in just by importing the CLI
+    probe = 'import sys, runstat; print(" ".join(m for m in ("pandas", "numpy") if m in sys.modules) or "none")'
+    out = subprocess.run([sys.executable, '-c', probe], cwd=root, stdout=subprocess.PIPE, universal_newlines=True)
+    print('  heavy imports at start-up:       {:s}'.format(out.stdout.strip()))
+
+def benchmark(args=None):
+    """Run the selected benchmark from the command line."""
+    parser = parse_args()
+    args = parser.parse_args(args)
+
+    if args.bench == 'lexer':
+        for path in args.filename:
+            bench_lexer(path, args.repeat)
+    elif args.bench == 'startup':
+        bench_startup(args.filename, args.repeat)
+
+def parse_args():
+    """Build and return the command-line argument parser for benchmarks."""
+    parser = argparse.ArgumentParser(
+        prog='Maxtouch Config benchmarks',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description='Measure parsing costs of the config tools')
+
+    parser.add_argument('bench', choices=('lexer', 'startup'),
+                        help='benchmark to run')
+
+    parser.add_argument('filename', nargs='+',
+                        metavar='FILE',
+                        help='xcfg files for \'lexer\', txt files for \'startup\'')
+
+    parser.add_argument('-n', '--repeat', type=int,
+                        default=3,
+                        help='runs per measurement, the best one is reported')
+
+    return parser
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1:])
@@ -1,19 +1,127 @@
 import os
 import sys
+import csv
+import hashlib
+import io
 import functools
-import pandas as pd
+import concurrent.futures
+import contextlib
+import mmap
+import struct
 import re
+import shutil
 import datetime
 
+from crc24 import Crc24, crc24_calculate, crc24_combine
 from verbose import VerboseMessage as v
 
 __metaclass__ = type
 
+__version__ = '1.2.10'
+
+class InfoBlock(dict):
+    """Ordered name/value mapping for header-style blocks.
+
+    A plain dict keeps lookups cheap and avoids pandas on the load path;
+    to_pandas() gives the Series form for interactive use.
+    """
+
+    def hex_values(self):
+        """Return a copy with every value formatted as 2-digit hex, for logging."""
+        return {name: '{:02X}'.format(val) for name, val in self.items()}
+
+    def to_pandas(self):
+        """Return the block as a pandas Series indexed by field name."""
+        import pandas as pd
+
+        return pd.Series(data=list(self.values()), index=list(self.keys()))
+
+class ObjectTitle(object):
+    """One object-title row: object, instance, length, address and memory offset."""
+
+    __slots__ = ('object', 'instance', 'length', 'address', 'offset')
+
+    def __init__(self, obj, ins, length, address=None, offset=0):
+        """Store the row fields.
+
+        Input:
+            obj: Object type number.
+            ins: Object instance.
+            length: Object size in bytes.
+            address: Object start address, None for raw files.
+            offset: Byte offset of the object in object_data.
+        Output:
+            None.
+        """
+        self.object = obj
+        self.instance = ins
+        self.length = length
+        self.address = address
+        self.offset = offset
+
+    def __getitem__(self, name):
+        """Read a field by column name, e.g. row['length']."""
+        return getattr(self, name)
+
+    def __repr__(self):
+        return 'ObjectTitle(object={}, instance={}, length={}, address={}, offset={})'.format(
+            self.object, self.instance, self.length, self.address, self.offset)
+
+class ObjectTitleTable(object):
+    """Object-title rows in file order with an (object, instance) index."""
+
+    __slots__ = ('names', 'rows', 'index')
+
+    def __init__(self, rows, names):
+        """Index the rows by (object, instance).
+
+        Input:
+            rows: List of ObjectTitle rows.
+            names: Column names present in the source file, including 'offset'.
+        Output:
+            None. The first row wins when an (object, instance) pair repeats.
+        """
+        self.names = tuple(names)
+        self.rows = rows
+        self.index = {}
+        for i, row in enumerate(rows):
+            self.index.setdefault((row.object, row.instance), i)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, idx):
+        return self.rows[idx]
+
+    def find(self, obj, ins=0):
+        """Return the row index of one object instance or None."""
+        return self.index.get((obj, ins))
+
+    def column(self, name):
+        """Return one column as a list in row order."""
+        return [getattr(row, name) for row in self.rows]
+
+    def to_pandas(self):
+        """Return the table as a pandas DataFrame with the source columns."""
+        import pandas as pd
+
+        return pd.DataFrame([[getattr(row, name) for name in self.names] for row in self.rows],
+                            columns=list(self.names))
+
+    def __repr__(self):
+        lines = [' '.join('{:>8s}'.format(name) for name in self.names)]
+        for row in self.rows:
+            lines.append(' '.join('{:>8}'.format(str(getattr(row, name))) for name in self.names))
+        return '\n'.join(lines)
+
 class BaseConfigBlock(object):
     """Shared container helpers for parsed config/header/object blocks."""
 
     OBJECT_TITLE_NAME = ('object', 'instance', 'length', 'address', 'offset')
-    BLOCK_NAME = ('comments', 'header_info', 'file_info', 'application_info', 'object_title', 'object_data')
+    BLOCK_NAME = ('comments', 'header_info', 'file_info', 'application_info', 'object_title', 'object_data', 'object_crc')
 
     def __init__(self):
         """Initialize the in-memory block storage.
@@ -27,15 +135,15 @@ class BaseConfigBlock(object):
         pass
 
     def build_info_block(self, name, data):
-        """Build a pandas Series for header-style name/value blocks.
+        """Build an InfoBlock mapping for header-style name/value blocks.
 
         Input:
             name: Iterable of field names.
             data: Iterable of values aligned with the field names.
         Output:
-            pandas.Series containing the supplied values indexed by field name.
+            InfoBlock containing the supplied values keyed by field name.
         """
-        block = pd.Series(data=data, index=name)
+        block = InfoBlock(zip(name, data))
 
         return block
 
@@ -45,18 +153,24 @@ class BaseConfigBlock(object):
         Input:
             title: List of object metadata rows.
         Output:
-            pandas.DataFrame with object, instance, length, address, and offset.
+            ObjectTitleTable with object, instance, length, address, and offset.
 
         Key steps:
-            1. Convert raw rows into a DataFrame.
-            2. Derive each object's byte offset from the cumulative length column.
+            1. Convert raw rows into ObjectTitle records.
+            2. Derive each object's byte offset from the cumulative length.
         """
-        title_new = pd.DataFrame(title, columns=self.OBJECT_TITLE_NAME[:len(title[0])])
-        off = [0]
-        off.extend(title_new['length'].cumsum()[:-1])
-        title_new['offset'] = pd.Series(off)    #object offset in memory
+        width = len(title[0]) if title else len(self.OBJECT_TITLE_NAME) - 1
+        names = self.OBJECT_TITLE_NAME[:width] + ('offset',)
 
-        return title_new
+        rows = []
+        off = 0
+        for item in title:
+            row = ObjectTitle(*item[:4])
+            row.offset = off    #object offset in memory
+            off += row.length
+            rows.append(row)
+
+        return ObjectTitleTable(rows, names)
 
     def set(self, name, val):
         """Store a parsed block by its well-known block name.
@@ -83,6 +197,55 @@ class BaseConfigBlock(object):
             return self.blocks[name]
         return default
 
+    def find_object(self, obj, ins=0):
+        """Find the object-title row of one object instance.
+
+        Input:
+            obj: Object type number, e.g. 9 for T9.
+            ins: Object instance.
+        Output:
+            Row index in object_title or None when the object is not present.
+        """
+        title = self.get('object_title')
+        if title is None:
+            return None
+
+        return title.find(obj, ins)
+
+    def object_view(self, obj, ins=0):
+        """Return a zero-copy view of one object instance's bytes.
+
+        Input:
+            obj: Object type number, e.g. 9 for T9.
+            ins: Object instance.
+        Output:
+            memoryview over object_data, or None when the object is not present.
+        """
+        idx = self.find_object(obj, ins)
+        data = self.get('object_data')
+        if idx is None or data is None:
+            return None
+
+        row = self.get('object_title')[idx]
+        return memoryview(data)[row.offset:row.offset + row.length]
+
+    def object_views(self):
+        """Iterate zero-copy views of all object instances in table order.
+
+        Input:
+            None.
+        Output:
+            Generator of (object, instance, memoryview) tuples.
+        """
+        title = self.get('object_title')
+        data = self.get('object_data')
+        if title is None or data is None:
+            return
+
+        view = memoryview(data)
+        for row in title:
+            yield row.object, row.instance, view[row.offset:row.offset + row.length]
+
     def clr(self, name=None):
         """Clear one parsed block or all parsed blocks.
 
@@ -124,10 +287,7 @@ class RawConfigParser(BaseConfigBlock):
             None. Initializes parser mode and file handle state.
         """
         super(RawConfigParser, self).__init__()
-        if hasattr(kwargs, 'method'):
-            self.method = kwargs['method']
-        else:
-            self.method = self.PARSE_FULL
+        self.method = kwargs.get('method', self.PARSE_FULL)
         self.f = None
 
     def __del__(self):
@@ -171,7 +331,7 @@ class RawConfigParser(BaseConfigBlock):
             return RawConfigParser.RAW_VERSION_4
         else:
             v.msg(v.ERR, 'Not a raw file, header comments{:s}'.format(str1))
-            return RawConfigParser.RAW_VERSION_0
+            return RawConfigParser.RAW_VERSION_NONE
 
     def load(self, path):
         """Parse a raw file into header/object blocks.
@@ -184,7 +344,8 @@ class RawConfigParser(BaseConfigBlock):
         Key steps:
             1. Read the raw version header and optional V3/V4 metadata lines.
             2. Parse the info block and CRC lines.
-            3. Optionally read and flatten object records when full parsing is enabled.
+            3. Optionally read and flatten object records when full parsing is enabled,
+               PARSE_HEADER stops reading the file after the CRC lines.
         """
 
         self.open(path)
@@ -194,9 +355,70 @@ class RawConfigParser(BaseConfigBlock):
 
         v.msg(v.INFO, path)
 
-        comments = []
+        self.read_content()
+
+    def loads(self, data):
+        """Parse raw content held in memory, see load().
+
+        Input:
+            data: bytes, str or file-like object with the raw file content.
+        Output:
+            None. Parsed content is stored into this instance via BaseConfigBlock.
+        """
+        self.close()
+        self.f = io.StringIO(read_buffer(data).decode('utf-8'), newline=None)
+        self.read_content()
+
+    def read_content(self):
+        """Parse the open raw file or buffer, used by load() and loads().
+
+        Input:
+            None. Reads from self.f.
+        Output:
+            None. The handle is closed afterwards.
+        """
         object_info = []
-        object_data = []
+        object_data = bytearray()
+
+        header = self.read_header()
+        if header is None:
+            self.close()
+            return
+
+        comments, version_info_datas = header
+
+        #[OBJECT_DATA]
+        if self.method == self.PARSE_FULL:
+            for line in self.f:
+                raw = list(map(functools.partial(int, base=16), line.split()))
+                object_info.append(raw[:3])    # title
+                object_data.extend(raw[3:])     # data
+
+        # list[string]
+        self.set('comments', comments)
+
+        # InfoBlock
+        header_info = self.build_info_block(self.RAW_INFO_BLOCK_NAME, version_info_datas)
+        self.set('header_info', header_info)
+
+        # list[OBJ_TITLE:ObjectTitleTable, OBJ_DATA:bytearray]
+        if self.method == self.PARSE_FULL:
+            object_title = self.build_object_title_block(object_info)
+            self.set('object_title', object_title)
+            self.set('object_data', object_data)
+
+        self.close()
+
+    def read_header(self):
+        """Read the header lines of the open raw file up to its first object record.
+
+        Input:
+            None. Reads from the file opened by open().
+        Output:
+            Tuple of (comments, info values up to CHECKSUM), or None for an
+            unsupported or encrypted file.
+        """
+        comments = []
 
         #[RAW_FILE_HEADER_MAGIC_WORD]
         line = self.f.readline()
@@ -204,7 +426,6 @@ class RawConfigParser(BaseConfigBlock):
 
         if not ver:
             v.msg(v.ERR, 'Non-supported raw file')
-            self.close()
             return
 
         comments.append(line)
@@ -243,31 +464,248 @@ class RawConfigParser(BaseConfigBlock):
             # drop it
             self.f.readline()
 
-        #[OBJECT_DATA]
-        if self.method == self.PARSE_FULL:
+        return comments, version_info_datas
+
+    def verify(self, path):
+        """Recalculate the config CRC of a raw file and compare it with the stored CHECKSUM.
+
+        Input:
+            path: Raw file path.
+        Output:
+            Tuple of (stored CHECKSUM, calculated CRC), or None when the file is
+            not a readable raw file. The calculated CRC is None without a
+            T14/T71/T7 start object. Raises ValueError on a malformed record.
+
+        Key steps:
+            1. Read the header lines only, as load() does.
+            2. Stream the object records, hex-decoding each one with bytes.fromhex()
+               and checking its length; T68 payload records are not part of the
+               config CRC and are skipped.
+            3. Feed a Crc24 from every start candidate not below the best one so
+               far in priority, as XcfgCalculateCRC.calculate() picks the last
+               instance 0 of T14 > T71 > T7, so the file is read once and no data
+               is kept.
+        """
+        self.open(path)
+
+        if not self.f:
+            return
+
+        v.msg(v.INFO, path)
+
+        try:
+            try:
+                header = self.read_header()
+            except IndexError:
+                raise ValueError('Truncated raw header')
+            if header is None:
+                return
+
+            if len(header[1]) != self.CHECKSUM + 1:
+                raise ValueError('Bad Info Block, {:d} values'.format(len(header[1])))
+
+            file_crc = header[1][self.CHECKSUM]
+            order = XcfgCalculateCRC.START_OBJECT_ORDER
+            payload = (XcfgBuildRawFile.PAYLOAD_OBJECT, XcfgBuildRawFile.PAYLOAD_INSTANCE)
+            best = None
+            crcs = {}   # start object -> Crc24 fed from that object on
+
             for line in self.f:
-                raw = list(map(functools.partial(int, base=16), line.split()))
-                object_info.append(raw[:3])    # title
-                object_data.extend(raw[3:])     # data
+                if line.startswith('['):
+                    # only DEVICE_0 is covered by the file CHECKSUM
+                    break
 
-        # list[string]
-        self.set('comments', comments)
+                fields = line.split(None, 3)
+                if len(fields) < 3:
+                    continue
 
-        # Series
-        header_info = self.build_info_block(self.RAW_INFO_BLOCK_NAME, version_info_datas)
-        self.set('header_info', header_info)
+                try:
+                    obj, ins, length = int(fields[0], 16), int(fields[1], 16), int(fields[2], 16)
+                    data = bytes.fromhex(fields[3]) if len(fields) > 3 else b''
+                except ValueError:
+                    raise ValueError('Bad object record: {:s}'.format(line.strip()))
+
+                if len(data) != length:
+                    raise ValueError('Object T{:d} instance {:d} has {:d} bytes, {:d} expected'.format(obj, ins, len(data), length))
+
+                if (obj, ins) == payload:
+                    continue
+
+                if ins == 0 and obj in order and (best is None or order[obj] <= order[best]):
+                    best = obj
+                    crcs[obj] = Crc24()
+                    # a lower priority start can no longer win
+                    for other in [x for x in crcs if order[x] > order[obj]]:
+                        del crcs[other]
+
+                for crc in crcs.values():
+                    crc.update(data)
+        finally:
+            self.close()
 
-        # list[OBJ_TITLE:DataFrame, OBJ_DATA:list[int]]
-        if self.method == self.PARSE_FULL:
-            object_title = self.build_object_title_block(object_info)
-            self.set('object_title', object_title)
-            self.set('object_data', object_data)
+        if best is None:
+            v.msg(v.ERR, 'Missed {} object, not CRC calculated'.format(list(order.keys())))
+            return file_crc, None
+
+        calculated_crc = crcs[best].intdigest()
+        v.msg(v.CONST, 'CRC: calculate={:6X}, raw={:6X} {:s}'.
+              format(calculated_crc, file_crc, '(matched)' if calculated_crc == file_crc else '(mismatch) X X X'))
+
+        return file_crc, calculated_crc
 
     def clear(self):
         """Clear parsed raw blocks and close the current file handle."""
         super(RawConfigParser, self).clr()
         self.close()
 
+def read_buffer(data):
+    """Return the content handed to a loads() method as bytes.
+
+    Input:
+        data: bytes-like, str (UTF-8) or file-like object opened in either mode.
+    Output:
+        bytes value.
+    """
+    if hasattr(data, 'read'):
+        data = data.read()
+
+    if isinstance(data, str):
+        return data.encode('utf-8')
+
+    return bytes(data)
+
+def file_digest(path, chunk_size=0x100000):
+    """Return the SHA-256 hex digest of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+
+    return h.hexdigest()
+
+def verify_raw(path):
+    """Verify the config CRC of one raw file.
+
+    Module-level so batch runs can hand it to a process pool.
+
+    Input:
+        path: Raw file path.
+    Output:
+        Tuple of (stored CHECKSUM, calculated CRC); raises ValueError when the
+        file is not a readable raw file.
+    """
+    result = RawConfigParser().verify(path)
+    if result is None:
+        raise ValueError('Not a readable raw file: {:s}'.format(path))
+
+    return result
+
+def read_raw_header(path):
+    """Read the Info Block of one raw file without decoding its object data.
+
+    Module-level so RawConfigScanner can hand it to a process pool.
+
+    Input:
+        path: Raw file path.
+    Output:
+        Tuple of (header values up to INFO_BLOCK_CHECKSUM or None, error string or None).
+    """
+    parser = RawConfigParser(method=RawConfigParser.PARSE_HEADER)
+    try:
+        parser.load(path)
+        info = parser.get('header_info')
+        if info is None:
+            return None, None
+
+        return list(info.values())[:RawConfigParser.INFO_BLOCK_CHECKSUM + 1], None
+    except Exception as e:
+        return None, str(e)
+    finally:
+        parser.close()
+
+@contextlib.contextmanager
+def mapped_output(path, size):
+    """Create a file of a known size and yield it memory-mapped for writing.
+
+    Input:
+        path: Output file path.
+        size: Final file size in bytes, at least 1.
+    Output:
+        Writable mmap. The file is removed again when the block raises.
+    """
+    with open(path, 'w+b') as f:
+        f.truncate(size)
+        mm = mmap.mmap(f.fileno(), size)
+        try:
+            yield mm
+        except BaseException:
+            mm.close()
+            f.close()
+            os.remove(path)
+            raise
+        mm.close()
+
+class XcfgLineMatch(object):
+    """Regex-match view over one alternative of the combined xcfg line pattern.
+
+    Group numbers are relative to the alternative, so group(1) means the same
+    as it does for the single pattern in tag_re_patterns/dat_re_patterns.
+    """
+
+    __slots__ = ('match', 'base', 'size')
+
+    def __init__(self, match, base, size):
+        """Wrap a combined-pattern match.
+
+        Input:
+            match: re.Match of the combined pattern.
+            base: Index of the named group wrapping the matched alternative.
+            size: Number of groups inside the alternative.
+        Output:
+            None.
+        """
+        self.match = match
+        self.base = base
+        self.size = size
+
+    def group(self, *idx):
+        """Return one or more groups, numbered within the alternative."""
+        if not idx:
+            return self.match.group(self.base)
+        if len(idx) == 1:
+            return self.match.group(self.base + idx[0])
+        return tuple(self.match.group(self.base + i) for i in idx)
+
+    def __getitem__(self, idx):
+        """Return one group, numbered within the alternative."""
+        return self.match.group(self.base + idx)
+
+    def groups(self):
+        """Return all groups of the matched alternative."""
+        return self.match.groups()[self.base:self.base + self.size]
+
+
+def build_line_lexer(tag_patterns, data_patterns):
+    """Compile tag and data line patterns into one alternation regex.
+
+    Input:
+        tag_patterns: Dict of section-header kind to pattern.
+        data_patterns: Dict of data-row kind to pattern.
+    Output:
+        Tuple of (compiled_regex, groups) where groups maps the index of each
+        alternative's named group to (kind, number_of_inner_groups, is_tag).
+        Alternatives keep dict order, tags first.
+    """
+    patterns = [(kind, ptn, True) for kind, ptn in tag_patterns.items()]
+    patterns.extend((kind, ptn, False) for kind, ptn in data_patterns.items())
+    regex = re.compile('|'.join('(?P<K{:d}>{:s})'.format(kind, ptn) for kind, ptn, _ in patterns))
+    groups = {}
+    for kind, ptn, is_tag in patterns:
+        groups[regex.groupindex['K{:d}'.format(kind)]] = (kind, re.compile(ptn).groups, is_tag)
+
+    return regex, groups
+
+
 class XcfgConfigParser(BaseConfigBlock):
     """Parser and writer for Microchip Studio XCFG files, including payload sections."""
 
@@ -286,6 +724,8 @@ class XcfgConfigParser(BaseConfigBlock):
     dat_re_patterns = {
         D_OBJ_VALUE: r'(\d+)[ \t]+(\d+)[ \t]+([^=]+)=(-?\d+)',
     }
+    # all tag and data patterns in one precompiled alternation, tags first
+    (LINE_RE, LINE_GROUPS) = build_line_lexer(tag_re_patterns, dat_re_patterns)
 
     # [COMMENTS]:
     (AUTHOR, DATE_TIME) = range(2)
@@ -313,7 +753,8 @@ class XcfgConfigParser(BaseConfigBlock):
     # [OBJECT_DATA]
     #(OBJ_TITLE, OBJ_DATA) = range(2)
 
-    EX_BLOCK_NAME = ('objects_num', 'calculated_crc', 'header_size', 'header_ext_data', 'version_info', 'file_version', 'device_name', 'payload_sections')
+    EX_BLOCK_NAME = ('objects_num', 'calculated_crc', 'header_size', 'header_ext_data', 'version_info', 'file_version', 'device_name', 'payload_sections',
+                     'object_crc_base', 'crc_start', 'edited_objects', 'checksum_line')
 
     def __init__(self):
         """Initialize parser state, extension storage, and file-handle fields."""
@@ -321,6 +762,8 @@ class XcfgConfigParser(BaseConfigBlock):
         self.exblocks = {}
         self.path = None
         self.f = None
+        self.xcfg_content = None
+        self.line_pos = None
 
     def __del__(self):
         """Close the opened XCFG file during object cleanup when needed."""
@@ -369,6 +812,37 @@ class XcfgConfigParser(BaseConfigBlock):
         else:
             return line
 
+    def read_lines(self, f, keep=None):
+        """Decode lines from a binary file lazily while tracking their position.
+
+        Input:
+            f: Binary file object.
+            keep: Optional list that collects every decoded line.
+        Output:
+            Generator of decoded lines. While a line is being consumed,
+            self.line_pos holds its (line_number, byte_offset, byte_size).
+        """
+        offset = 0
+        for i, raw in enumerate(f):
+            self.line_pos = (i, offset, len(raw))
+            offset += len(raw)
+            line = self.decode(raw)
+            if keep is not None:
+                keep.append(line)
+            yield line
+
+    def source_lines(self):
+        """Re-read the loaded xcfg file lazily, used by save() in stream mode.
+
+        Input:
+            None.
+        Output:
+            Generator of decoded lines of the file at self.path.
+        """
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                yield self.decode(raw)
+
     def strip(self, line):
         """Remove BOM characters and surrounding whitespace from a line.
 
@@ -377,13 +851,8 @@ class XcfgConfigParser(BaseConfigBlock):
         Output:
             Sanitized string without BOM prefix or surrounding whitespace.
         """
-        for i, a in enumerate(line):
-            # studio xcfg with utf-8 will has this head
-            if a != '\ufeff':
-                break
-
-        raw = line[i:]
-        return raw.strip()
+        # studio xcfg with utf-8 will has this head
+        return line.lstrip('\ufeff').strip()
 
     def set_ext(self, name, val):
         """Store parser extension metadata that does not belong to BaseConfigBlock.
@@ -414,6 +883,47 @@ class XcfgConfigParser(BaseConfigBlock):
         """Return the currently loaded xcfg path."""
         return self.path
 
+    def classify(self, line):
+        """Classify one xcfg line with the combined tag/data pattern.
+
+        Input:
+            line: Candidate xcfg line.
+        Output:
+            Tuple of (kind, match) where kind is a T_* tag or D_* data id and
+            match is an XcfgLineMatch, or (None, None) for any other line.
+        """
+        raw = line.strip()
+        if raw.startswith('\ufeff'):
+            # studio xcfg with utf-8 will has this head
+            raw = raw.lstrip('\ufeff')
+
+        m = self.LINE_RE.match(raw)
+        if m is None:
+            return (None, None)
+
+        kind, size, is_tag = self.LINE_GROUPS[m.lastindex]
+        if is_tag and not raw.endswith(']'):
+            return (None, None)
+
+        return kind, XcfgLineMatch(m, m.lastindex, size)
+
+    def lex(self, lines):
+        """Classify lines lazily, each line exactly once.
+
+        Input:
+            lines: Iterable of xcfg text lines.
+        Output:
+            Generator of (line, kind, match) tokens, see classify().
+        """
+        classify = self.classify
+        for line in lines:
+            kind, match = classify(line)
+            yield line, kind, match
+
+    def is_tag(self, kind):
+        """Return True when a classified kind is a section header tag."""
+        return kind in self.tag_re_patterns
+
     def check_header(self, line):
         """Match a line against known XCFG section headers.
 
@@ -422,13 +932,9 @@ class XcfgConfigParser(BaseConfigBlock):
         Output:
             Tuple of (tag_id, regex_match) or (None, None).
         """
-        raw = self.strip(line)
-        if raw.startswith('[') and raw.endswith(']'):
-            for tag, ptn in self.tag_re_patterns.items():
-                re_tag = re.compile(ptn)
-                result = re_tag.match(raw)
-                if result:
-                    return tag, result
+        kind, match = self.classify(line)
+        if kind in self.tag_re_patterns:
+            return kind, match
 
         return (None, None)
 
@@ -440,12 +946,9 @@ class XcfgConfigParser(BaseConfigBlock):
         Output:
             Tuple of (data_tag_id, regex_match) or (None, None).
         """
-        raw = self.strip(line)
-        for tag, ptn in self.dat_re_patterns.items():
-            re_tag = re.compile(ptn)
-            result = re_tag.match(raw)
-            if result:
-                return tag, result
+        kind, match = self.classify(line)
+        if kind in self.dat_re_patterns:
+            return kind, match
 
         return (None, None)
 
@@ -453,32 +956,33 @@ class XcfgConfigParser(BaseConfigBlock):
         """Parse the free-form [COMMENTS] section.
 
         Input:
-            it: Iterator over xcfg lines positioned after the header tag.
+            it: Iterator over lexed xcfg tokens positioned after the header tag.
         Output:
-            Tuple of (comment_lines, next_header_line).
+            Tuple of (comment_lines, next_header_token).
         """
         info = []
-        line = None
-        for line in it:
+        token = None
+        for token in it:
+            line, tag, _ = token
             if line.isspace():
                 continue
 
-            tag, _ = self.check_header(line)
-            if tag:
+            if self.is_tag(tag):
                 break
 
             info.append(line.strip())
 
-        return info, line
+        return info, token
 
 
-    def parse_name_value_pairs(self, it):
+    def parse_name_value_pairs(self, it, positions=None):
         """Parse simple NAME=VALUE sections into parallel name/value arrays.
 
         Input:
-            it: Iterator over xcfg lines positioned after a section header.
+            it: Iterator over lexed xcfg tokens positioned after a section header.
+            positions: Optional dict filled with NAME -> self.line_pos of its line.
         Output:
-            Tuple of (name_list, value_list, next_header_line).
+            Tuple of (name_list, value_list, next_header_token).
 
         Key steps:
             1. Stop when the next section header is encountered.
@@ -487,13 +991,13 @@ class XcfgConfigParser(BaseConfigBlock):
         """
         name = []
         data = []
-        line = None
-        for line in it:
+        token = None
+        for token in it:
+            line, tag, _ = token
             if line.isspace():
                 continue
 
-            tag, _ = self.check_header(line)
-            if tag:
+            if self.is_tag(tag):
                 break
 
             raw = line.strip().split('=')
@@ -510,24 +1014,27 @@ class XcfgConfigParser(BaseConfigBlock):
                 finally:
                     name.append(raw[0].strip())
                     data.append(val)
+                    if positions is not None:
+                        positions[name[-1]] = self.line_pos
 
-        return name, data, line
+        return name, data, token
 
-    def parse_version_info(self, it):
+    def parse_version_info(self, it, positions=None):
         """Parse the [VERSION_INFO_HEADER] body.
 
         Input:
-            it: Iterator over xcfg lines.
+            it: Iterator over lexed xcfg tokens.
+            positions: Optional dict filled with NAME -> line position.
         Output:
             Same tuple format as parse_name_value_pairs.
         """
-        return self.parse_name_value_pairs(it)
+        return self.parse_name_value_pairs(it, positions)
 
     def parse_file_info(self, it):
         """Parse the [FILE_INFO_HEADER] body.
 
         Input:
-            it: Iterator over xcfg lines.
+            it: Iterator over lexed xcfg tokens.
         Output:
             Same tuple format as parse_name_value_pairs.
         """
@@ -537,29 +1044,29 @@ class XcfgConfigParser(BaseConfigBlock):
         """Parse the [APPLICATION_INFO_HEADER] body.
 
         Input:
-            it: Iterator over xcfg lines.
+            it: Iterator over lexed xcfg tokens.
         Output:
-            Tuple of (application_info_lines, next_header_line).
+            Tuple of (application_info_lines, next_header_token).
         """
         info = []
-        line = None
-        for line in it:
+        token = None
+        for token in it:
+            line, tag, _ = token
             if line.isspace():
                 continue
 
-            tag, _ = self.check_header(line)
-            if tag:
+            if self.is_tag(tag):
                 break
 
             info.append(line.strip())
 
-        return info, line
+        return info, token
 
     def parse_device_data(self, it):
         """Parse device-specific header fields that follow [DEVICE_n].
 
         Input:
-            it: Iterator over xcfg lines.
+            it: Iterator over lexed xcfg tokens.
         Output:
             Same tuple format as parse_name_value_pairs.
         """
@@ -569,42 +1076,36 @@ class XcfgConfigParser(BaseConfigBlock):
         """Parse a T68 payload section and preserve its metadata and bytes.
 
         Input:
-            it: Iterator over xcfg lines positioned after the payload header.
+            it: Iterator over lexed xcfg tokens positioned after the payload header.
             section_name: Payload section tag name.
         Output:
-            Tuple of (payload_dict, next_header_line).
+            Tuple of (payload_dict, next_header_token).
 
         Key steps:
             1. Read payload checksum/size fields.
             2. Expand packed integer DATA rows into little-endian bytes.
             3. Pad or truncate to the declared payload size.
         """
-        line = None
+        token = None
         payload = {
             'name': section_name,
             'checksum': 0,
             'size': 0,
-            'data': [],
+            'data': bytearray(),
         }
 
-        for line in it:
-            if line is None:
-                break
-
+        for token in it:
+            line, tag, match = token
             if line.isspace():
                 continue
 
-            tag, _ = self.check_header(line)
-            if tag:
+            if self.is_tag(tag):
                 break
 
-            data_tag, match = self.check_data(line)
-            if data_tag is self.D_OBJ_VALUE:
+            if tag is self.D_OBJ_VALUE:
                 length = int(match.group(2))
                 value = int(match.group(4))
-                for _ in range(length):
-                    payload['data'].append(value & 0xff)
-                    value >>= 8
+                payload['data'].extend((value & ((1 << (length * 8)) - 1)).to_bytes(length, 'little'))
                 continue
 
             raw = line.strip().split('=', 1)
@@ -627,19 +1128,19 @@ class XcfgConfigParser(BaseConfigBlock):
         data = payload['data']
         if size:
             if len(data) < size:
-                data.extend([0] * (size - len(data)))
+                data.extend(bytes(size - len(data)))
             elif len(data) > size:
                 payload['data'] = data[:size]
 
-        return payload, line
+        return payload, token
 
     def parse_object_data(self, it):
         """Parse one object section's address, size, and flattened data bytes.
 
         Input:
-            it: Iterator over xcfg lines positioned after an object header.
+            it: Iterator over lexed xcfg tokens positioned after an object header.
         Output:
-            Tuple of (info_list, data_bytes, next_header_line).
+            Tuple of (info_list, data_bytes, last_token).
 
         Key steps:
             1. Read OBJECT_ADDRESS and OBJECT_SIZE.
@@ -648,7 +1149,7 @@ class XcfgConfigParser(BaseConfigBlock):
         """
 
         (address, size) = range(2)
-        line = None
+        token = None
 
         #adress, size
         #   e.g:
@@ -656,11 +1157,11 @@ class XcfgConfigParser(BaseConfigBlock):
         #       OBJECT_SIZE = 240
         info = []
         for i in range(2):
-            line = next(it, None)
-            if line is None:
+            token = next(it, None)
+            if token is None:
                 break
 
-            line = line.strip()
+            line = token[0].strip()
             if not line:
                 break
 
@@ -669,24 +1170,24 @@ class XcfgConfigParser(BaseConfigBlock):
                 info.append(int(raw[1]))
 
         if len(info) != 2:
-            return None, None, line
+            return None, None, token
 
         #data
         #   e.g:
         #       0 1 DATA[0]=0
         #       1 1 DATA[1]=0
         #       ...
-        data = []
+        data = bytearray()
         for i in range(info[size]):
-            line = next(it, None)
-            if line is None:
+            token = next(it, None)
+            if token is None:
                 break
 
+            line, tag, _ = token
             line = line.strip()
             if not line:
                 break
 
-            tag, _ = self.check_data(line)
             if tag is not self.D_OBJ_VALUE:
                 print("data crashed at OBJECT_ADDRESS[{}] OBJECT_SIZE[{}]: {}".format(info[address], info[size], data))
                 if len(line.split('=')) != 2:
@@ -700,9 +1201,7 @@ class XcfgConfigParser(BaseConfigBlock):
                     raw2 = raw[2].split('=')
                     if len(raw2) == 2:
                         val = int(raw2[1])
-                        for j in range(length):
-                            data.append(val & 0xff)
-                            val >>= 8
+                        data.extend((val & ((1 << (length * 8)) - 1)).to_bytes(length, 'little'))
                 except Exception as error:
                     print('Parse data line failed', line, error)
                     break
@@ -712,13 +1211,13 @@ class XcfgConfigParser(BaseConfigBlock):
             else:
                 break
 
-        return info, data, line
+        return info, data, token
 
     def extract_info_block(self, header, file_ver):
-        """Remove version-specific extra fields from the main header series.
+        """Remove version-specific extra fields from the main header block.
 
         Input:
-            header: pandas.Series for the version header.
+            header: InfoBlock for the version header.
             file_ver: Parsed xcfg version.
         Output:
             List of removed extra-field values in declared order.
@@ -732,16 +1231,18 @@ class XcfgConfigParser(BaseConfigBlock):
 
         return ext
 
-    def load(self, path):
+    def load(self, path, stream=False):
         """Parse an xcfg file, calculate CRC, and store all derived blocks.
 
         Input:
             path: Path to the xcfg file.
+            stream: When True, parse the file lazily and keep no text in memory;
+                save() then re-reads the file instead of using xcfg_content.
         Output:
             None. Parsed data is stored on the parser instance.
 
         Key steps:
-            1. Walk through headers using a state-machine loop.
+            1. Walk through lexed (line, kind, match) tokens using a state-machine loop.
             2. Parse standard blocks, object data, and payload sections.
             3. Build header/object tables and calculate the configuration CRC.
         """
@@ -755,31 +1256,39 @@ class XcfgConfigParser(BaseConfigBlock):
         version_info_datas = []
         application_info = []
         object_info = []
-        object_data = []
+        object_data = bytearray()
         payload_sections = []
         device_name = None
         file_info_names = None
+        object_crc = []
+        version_info_pos = {}
 
-        self.xcfg_content = list(map(self.decode, self.f.readlines()))
-        it = iter(self.xcfg_content)
-        line = next(it, None)
-        while line:
+        if stream:
+            self.xcfg_content = None
+            lines = self.read_lines(self.f)
+        else:
+            self.xcfg_content = []
+            lines = self.read_lines(self.f, self.xcfg_content)
+
+        it = self.lex(lines)
+        token = next(it, None)
+        while token:
+            line, tag, result = token
             if line.isspace():
-                line = next(it, None)
+                token = next(it, None)
                 continue
 
-            tag, result = self.check_header(line)
-            if result:
+            if self.is_tag(tag):
                 if tag is self.T_COMMENTS:
-                    comments, line = self.parse_comments(it)
+                    comments, token = self.parse_comments(it)
                 elif tag is self.T_VERSION_INFO_HEADER:
-                    version_info_names, version_info_datas, line = self.parse_version_info(it)
+                    version_info_names, version_info_datas, token = self.parse_version_info(it, version_info_pos)
                 elif tag is self.T_FILE_INFO_HEADER:
-                    file_info_names, file_info_datas, line = self.parse_file_info(it)
+                    file_info_names, file_info_datas, token = self.parse_file_info(it)
                 elif tag is self.T_APPLICATION_INFO_HEADER:
-                    application_info, line = self.parse_app_info(it)
+                    application_info, token = self.parse_app_info(it)
                 elif tag is self.T_DEVICE:
-                    _, _, line = self.parse_device_data(it)
+                    _, _, token = self.parse_device_data(it)
                     device_name = result[1]
                     # remove the device name in version_info_names
                     for i, name in enumerate(version_info_names):
@@ -787,7 +1296,7 @@ class XcfgConfigParser(BaseConfigBlock):
                             version_info_names[i] = name.replace("_" + device_name, "")
                             break
                 elif tag is self.T_PAYLOAD_DATA:
-                    payload, line = self.parse_payload_data(it, result.group(1))
+                    payload, token = self.parse_payload_data(it, result.group(1))
                     if payload is not None:
                         payload_sections.append(payload)
                 elif tag is self.T_OBJECT_DATA:
@@ -795,16 +1304,16 @@ class XcfgConfigParser(BaseConfigBlock):
                         obj = int(result.group(1))
                         ins = int(result.group(2))
 
-                        info, data, line = self.parse_object_data(it)
+                        info, data, token = self.parse_object_data(it)
                         (address, size) = range(2)
-                        if len(info) == 2:
+                        if info and len(info) == 2:
                             if len(data) != info[size]:
                                 print("data size mismatch(expect {}, actual {}), crc calcalation may error".format(
                                     info[size], len(data)))
                                 # if termined unexpected, filled zero
                                 left = info[size] - len(data)
                                 if left > 0:
-                                    pad = [0] * left
+                                    pad = bytes(left)
                                     print('data not enough, filled {} zero at address'.format(left), info, ":", data, pad)
                                     data.extend(pad)
                                 else:
@@ -813,6 +1322,7 @@ class XcfgConfigParser(BaseConfigBlock):
 
                             # OBJECT_TITLE_NAME
                             object_info.append([obj, ins, info[size], info[address]])
+                            object_crc.append(crc24_calculate(data, phase=len(object_data)))
                             object_data.extend(data)
                         else:
                             v.msg(v.WARN, 'Mismatched object info, data: ', info, data)
@@ -821,15 +1331,18 @@ class XcfgConfigParser(BaseConfigBlock):
             else:
                 v.msg(v.WARN, 'Skip unknowns line: ', line)
 
-            tag, _ = self.check_header(line)
-            if not tag:
-                line = next(it, None)
+            if token is None or not self.is_tag(token[1]):
+                token = next(it, None)
             else:
-                v.msg(v.DEBUG2, 'Use former tag line: ', line)
+                v.msg(v.DEBUG2, 'Use former tag line: ', token[0])
                 pass
 
         #end while
 
+        # the text is kept in xcfg_content, or re-read by source_lines() in stream mode
+        self.f.close()
+        self.f = None
+
         # Save Comments
         self.set('comments', comments)
         # Save Version info
@@ -839,6 +1352,8 @@ class XcfgConfigParser(BaseConfigBlock):
         # save Device info
         self.set_ext('device_name', device_name)
         self.set_ext('payload_sections', payload_sections)
+        # (line_number, byte_offset, byte_size) of the config checksum line
+        self.set_ext('checksum_line', version_info_pos.get(self._full_checksum_name()))
 
         # Save File info
         if file_info_names:
@@ -862,10 +1377,12 @@ class XcfgConfigParser(BaseConfigBlock):
         #list[string]
         self.set('application_info', application_info)
 
-        #list[OBJ_TITLE:DataFrame, OBJ_DATA:list[int]]
+        #list[OBJ_TITLE:ObjectTitleTable, OBJ_DATA:bytearray]
         object_title = self.build_object_title_block(object_info)
         self.set('object_title', object_title)
         self.set('object_data', object_data)
+        self.set('object_crc', object_crc)
+        self.set_ext('object_crc_base', 0)
 
         objects_num = self.objects_num()
         self.set_ext('objects_num', objects_num)
@@ -875,6 +1392,24 @@ class XcfgConfigParser(BaseConfigBlock):
         self.set_ext('calculated_crc', calculated_crc)
         del xCrc
 
+    def loads(self, data, name=None):
+        """Parse xcfg content held in memory, see load().
+
+        Input:
+            data: bytes, str or file-like object with the xcfg content.
+            name: Optional file name of the content, used by save() to name
+                and place the rebuilt file; dumps() needs none.
+        Output:
+            None. Parsed data is stored on the parser instance.
+        """
+        if self.f:
+            self.f.close()
+
+        self.f = io.BytesIO(read_buffer(data))
+        self.path = name
+        # load() keeps the buffer as no path is given, the content is kept for dumps()
+        self.load(None)
+
     def _full_checksum_name(self):
         """Resolve the checksum field name, including a device suffix when needed.
 
@@ -966,9 +1501,8 @@ class XcfgConfigParser(BaseConfigBlock):
         else:
             v.msg(v.WARN, 'Use Calculated CRC ({:06X}) overwrite File CRC({:06X})'.format(calculated_crc, config_crc))
 
-            for i, line in enumerate(content):
-                tag, result = self.check_header(line)
-                if result:
+            for i, (line, tag, result) in enumerate(self.lex(content)):
+                if self.is_tag(tag):
                     if tag is self.T_COMMENTS:
                         pass
                     elif tag is self.T_FILE_INFO_HEADER:
@@ -990,31 +1524,149 @@ class XcfgConfigParser(BaseConfigBlock):
                         break
             return content
 
-    def convert_output_format(self, content, ver):
-        """Convert higher-version xcfg text into the low-version compatible format.
+    def iter_checksum(self, content):
+        """Streaming counterpart of replace_checksum using the line recorded at load.
 
         Input:
-            content: Full xcfg file content.
-            ver: Target output version.
+            content: Iterable of xcfg lines in file order.
         Output:
-            New list of xcfg lines after format conversion.
+            Generator of lines with the checksum line replaced, or None when
+            no replacement is needed.
+        """
+
+        calculated_crc = self.calculated_crc()
+        config_crc = self.config_crc()
+
+        if calculated_crc == config_crc:
+            v.msg(v.INFO, 'Config CRC matched ({:06X}), Skip save xcfg file'.format(config_crc))
+            return None
+
+        v.msg(v.WARN, 'Use Calculated CRC ({:06X}) overwrite File CRC({:06X})'.format(calculated_crc, config_crc))
+
+        checksum_line = self.get_ext('checksum_line')
+        if checksum_line is None:
+            v.msg(v.ERR, 'Overwrite CRC failed, {:s} not found in header'.format(self.INFO_BLOCK_NAME[self.CHECKSUM]))
+            return iter(content)
+
+        data = '{:s}=0x{:06X}\r\n'.format(self._full_checksum_name(), calculated_crc)
+        return (data if i == checksum_line[0] else line for i, line in enumerate(content))
+
+    def patch_checksum(self):
+        """Overwrite the config checksum of the loaded xcfg file itself.
+
+        Input:
+            None.
+        Output:
+            Path of the patched file, or None when the checksum already matches
+            or its line was not found.
 
         Key steps:
-            1. Drop unsupported low-version sections like FILE_INFO_HEADER and DEVICE blocks.
-            2. Rename device-specific checksum fields when converting to V1.
-            3. Preserve higher-version fields only when the target format allows them.
+            1. Re-read the checksum line at the (line, offset, size) recorded by
+               load() and check it still holds the checksum.
+            2. Same width: overwrite those bytes in place.
+            3. Other width: copy the file around the new line into a temp file
+               and rename it over the source.
         """
 
-        v.msg(v.INFO, 'Convert config from V{} version to V1 version:'.format(ver))
-        content_new = []
-        tag = None
-        for line in content:
-            drop = False
-            t, hit_tag = self.check_header(line)
-            if hit_tag:
-                tag = t
-
-            if tag is self.T_VERSION_INFO_HEADER:
+        calculated_crc = self.calculated_crc()
+        config_crc = self.config_crc()
+        if calculated_crc is None:
+            return None
+
+        if calculated_crc == config_crc:
+            v.msg(v.INFO, 'Config CRC matched ({:06X}), Skip save xcfg file'.format(config_crc))
+            return None
+
+        v.msg(v.WARN, 'Use Calculated CRC ({:06X}) overwrite File CRC({:06X})'.format(calculated_crc, config_crc))
+
+        checksum_line = self.get_ext('checksum_line')
+        if checksum_line is None:
+            v.msg(v.ERR, 'Overwrite CRC failed, {:s} not found in header'.format(self.INFO_BLOCK_NAME[self.CHECKSUM]))
+            return None
+
+        _, offset, size = checksum_line
+        path = self.get_path()
+        if not path or not os.path.isfile(path):
+            raise ValueError('Patch in place needs the loaded xcfg file, use save() or dumps() for loads() content')
+
+        # an open handle on the source makes os.replace() fail on Windows
+        if self.f:
+            self.f.close()
+            self.f = None
+
+        with open(path, 'r+b') as f:
+            f.seek(offset)
+            line = self.decode(f.read(size))
+            name, sep, value = line.partition('=')
+            if not sep or name.strip() != self._full_checksum_name():
+                raise ValueError('Checksum line moved since load: {:s}'.format(path))
+
+            # keep the spacing and line ending of the original line
+            body = value.rstrip('\r\n')
+            lead = body[:len(body) - len(body.lstrip())]
+            data = self.encode('{:s}={:s}0x{:06X}{:s}'.format(name, lead, calculated_crc, value[len(body):]))
+
+            if len(data) == size:
+                f.seek(offset)
+                f.write(data)
+
+        if len(data) != size:
+            tmp = path + '.tmp'
+            with open(path, 'rb') as infile, open(tmp, 'wb') as outfile:
+                left = offset
+                while left:
+                    chunk = infile.read(min(left, 0x100000))
+                    if not chunk:
+                        break
+                    outfile.write(chunk)
+                    left -= len(chunk)
+                outfile.write(data)
+                infile.seek(offset + size)
+                shutil.copyfileobj(infile, outfile)
+            shutil.copymode(path, tmp)
+            os.replace(tmp, path)
+
+        self.set_ext('checksum_line', (checksum_line[0], offset, len(data)))
+        v.msg(v.CONST, 'Patch xcfg checksum in place: {:s}'.format(path))
+
+        return path
+
+    def convert_output_format(self, content, ver):
+        """Convert higher-version xcfg text into the low-version compatible format.
+
+        Input:
+            content: Full xcfg file content.
+            ver: Target output version.
+        Output:
+            New list of xcfg lines after format conversion.
+
+        Key steps:
+            1. Drop unsupported low-version sections like FILE_INFO_HEADER and DEVICE blocks.
+            2. Rename device-specific checksum fields when converting to V1.
+            3. Preserve higher-version fields only when the target format allows them.
+        """
+
+        return list(self.iter_output_format(content, ver))
+
+    def iter_output_format(self, content, ver):
+        """Lazily convert higher-version xcfg lines, see convert_output_format.
+
+        Input:
+            content: Iterable of xcfg lines.
+            ver: Target output version.
+        Output:
+            Generator of converted xcfg lines.
+        """
+
+        v.msg(v.INFO, 'Convert config from V{} version to V1 version:'.format(ver))
+        tag = None
+        for line, t, _ in self.lex(content):
+            drop = False
+            hit_tag = self.is_tag(t)
+            if hit_tag:
+                tag = t
+
+            if tag is self.T_VERSION_INFO_HEADER:
                 if not hit_tag:
                     if not line.isspace():
                         raw = line.strip().split('=')
@@ -1043,45 +1695,50 @@ class XcfgConfigParser(BaseConfigBlock):
                 pass
 
             if not drop:
-                content_new.append(line)
-        
-        return content_new
+                yield line
 
-    def save(self, output, path=None):
-        """Save a rebuilt xcfg file using the resolved checksum and output-version policy.
+    def rebuild_content(self, output):
+        """Build the rebuilt xcfg lines shared by save() and dumps().
 
         Input:
             output: CLI output selector or None.
-            path: Optional base path used to derive the output directory/name.
         Output:
-            None. Writes a rebuilt xcfg file when content needs to change.
+            Tuple of (lines, output file version), or None when content needs
+            no change. In stream mode the lines are a generator over the
+            re-read source file.
 
         Key steps:
-            1. Replace the checksum when needed.
+            1. Write back edited object rows and replace the checksum when needed.
             2. Optionally convert higher-version content to V1-compatible format.
-            3. Build a timestamped relative output filename and write the file.
         """
 
-        if not self.xcfg_content:
+        # stream mode keeps no text, content is re-read from the source file lazily
+        stream = self.xcfg_content is None
+        if stream and self.calculated_crc() is None:
             return
 
-        if not path:
-            path = self.get_path()
+        if not stream and not self.xcfg_content:
+            return
 
         generate = False
+        content = self.source_lines() if stream else self.xcfg_content
+        # Write back the object bytes changed by set_bytes()
+        if self.get_ext('edited_objects'):
+            content = self.iter_object_edits(content) if stream else self.apply_object_edits(content)
+            generate = True
+
         # Replace the checksum if mismatch
-        content = self.replace_checksum(self.xcfg_content)
-        if content:
+        content_new = self.iter_checksum(content) if stream else self.replace_checksum(content)
+        if content_new:
             generate = True
-        else:
-             content = self.xcfg_content
+            content = content_new
 
         # Convert the output version format
         file_ver = self.get_ext('file_version')
         target_ver = self.output_version(output)
 
         if target_ver == 1 and file_ver > 1: # Output assigned to version 1
-            content = self.convert_output_format(content, target_ver)
+            content = self.iter_output_format(content, target_ver) if stream else self.convert_output_format(content, target_ver)
             if content:
                 generate = True
                 file_ver = target_ver
@@ -1091,17 +1748,76 @@ class XcfgConfigParser(BaseConfigBlock):
         if not generate:
             return
 
+        return content, file_ver
+
+    def save(self, output, path=None, in_place=False):
+        """Save a rebuilt xcfg file using the resolved checksum and output-version policy.
+
+        Input:
+            output: CLI output selector or None.
+            path: Optional base path used to derive the output directory/name.
+            in_place: Patch the checksum of the source file with patch_checksum()
+                instead, when that is the only change.
+        Output:
+            Path of the rebuilt (or patched) xcfg file, or None when content
+            needs no change.
+
+        Key steps:
+            1. Build the rebuilt lines with rebuild_content().
+            2. Build a timestamped relative output filename and write the file.
+               In stream mode every step runs lazily over the re-read source file.
+        """
+
+        if in_place and self.calculated_crc() is not None:
+            if self.get_ext('edited_objects') or (self.output_version(output) == 1 and self.get_ext('file_version') > 1):
+                v.msg(v.WARN, 'Not only the checksum changes, save a rebuilt file instead of patching in place')
+            else:
+                return self.patch_checksum()
+
+        rebuilt = self.rebuild_content(output)
+        if rebuilt is None:
+            return
+
+        content, file_ver = rebuilt
+
+        filename = self.output_filename(file_ver, path)
+        v.msg(v.CONST, 'Save xcfg file to: {:s}'.format(filename))
+
+        with open(filename, 'wb') as outfile:
+            for line in content:
+                outfile.write(self.encode(line))
+            #outfile.write(''.join(map(byte, content))
+            #outfile.write('\n')
+            outfile.close()
+
+        return filename
+
+    def output_filename(self, file_ver, path=None):
+        """Build the timestamped file name of a rebuilt xcfg.
+
+        Input:
+            file_ver: Version of the rebuilt content.
+            path: Optional base path used to derive the output directory/name.
+        Output:
+            Output path; an existing file of that name is removed.
+        """
+        if not path:
+            path = self.get_path()
+
+        if not path:
+            raise ValueError('No file name for the rebuilt xcfg, pass a path or use dumps()')
+
         dir = os.path.dirname(path)
         name = os.path.basename(path)
 
         if not dir:
-            dir = os.path.dirname(self.get_path())
+            dir = os.path.dirname(self.get_path() or '')
 
         if not dir:
             dir = os.getcwd()
 
         if not name:
-            name = os.path.basename(self.get_path())
+            name = os.path.basename(self.get_path() or '')
 
         raw = name.rsplit('.', 1)
         main = raw[0]
@@ -1110,16 +1826,24 @@ class XcfgConfigParser(BaseConfigBlock):
         now = datetime.datetime.now()
         basename = '.'.join([main, 'rebuild(v{:d})_at'.format(file_ver), now.strftime('%Y%m%d_%H%M%S'), 'crc_0x{:06X}'.format(self.calculated_crc()), ext])
         filename = os.path.join(dir, basename)
-        v.msg(v.CONST, 'Save xcfg file to: {:s}'.format(filename))
         if os.path.exists(filename):
             os.remove(filename)
 
-        with open(filename, 'wb') as outfile:
-            for line in content:
-                outfile.write(self.encode(line))
-            #outfile.write(''.join(map(byte, content))
-            #outfile.write('\n')
-            outfile.close()
+        return filename
+
+    def dumps(self, output=None):
+        """Return the rebuilt xcfg file content that save() would write.
+
+        Input:
+            output: CLI output selector or None.
+        Output:
+            bytes of the rebuilt file, or None when content needs no change.
+        """
+        rebuilt = self.rebuild_content(output)
+        if rebuilt is None:
+            return None
+
+        return b''.join(map(self.encode, rebuilt[0]))
 
     def objects_num(self, default=0):
         """Estimate the raw object-count field used in raw header export.
@@ -1133,7 +1857,7 @@ class XcfgConfigParser(BaseConfigBlock):
         num = default
         title = self.get('object_title')
         if title is not None:
-            objects = set(title['object'])
+            objects = set(title.column('object'))
             num = len(objects) + 2  #T9/T100 T6
             if 100 in objects:
                 num += 1    #T44
@@ -1150,7 +1874,7 @@ class XcfgConfigParser(BaseConfigBlock):
         """
         header = self.get('header_info')
         if header is not None and len(header) >= self.INFO_BLOCK_CHECKSUM:
-            return header.loc[self.INFO_BLOCK_NAME[self.INFO_BLOCK_CHECKSUM]]
+            return header[self.INFO_BLOCK_NAME[self.INFO_BLOCK_CHECKSUM]]
 
         return default
 
@@ -1164,7 +1888,7 @@ class XcfgConfigParser(BaseConfigBlock):
         """
         header = self.get('header_info')
         if header is not None and len(header) >= self.CHECKSUM:
-            return header.loc[self.INFO_BLOCK_NAME[self.CHECKSUM]]
+            return header[self.INFO_BLOCK_NAME[self.CHECKSUM]]
 
         return default
 
@@ -1178,9 +1902,113 @@ class XcfgConfigParser(BaseConfigBlock):
         """
         return self.get_ext('calculated_crc', default)
 
+    def set_bytes(self, obj, ins, offset, values):
+        """Patch bytes of one object instance and update the calculated CRC in place.
+
+        Input:
+            obj: Object type number, e.g. 9 for T9.
+            ins: Object instance.
+            offset: Byte offset inside the object.
+            values: Iterable of new byte values.
+        Output:
+            Updated calculated CRC integer.
+
+        Key steps:
+            1. Xor the old and new bytes into a delta block, then store the new bytes.
+            2. The CRC is linear, so the CRC of the delta advanced over the bytes
+               behind it is xor-ed into the object CRC cache and the calculated CRC.
+            3. Mark the object so save() rewrites its data rows.
+        """
+        idx = self.find_object(obj, ins)
+        if idx is None:
+            raise ValueError('Object T{:d} instance {:d} not found'.format(obj, ins))
+
+        title = self.get('object_title')
+        data = self.get('object_data')
+        values = bytes(values)
+        off = title[idx].offset
+        length = title[idx].length
+        if offset < 0 or offset + len(values) > length:
+            raise ValueError('Invalid range T{:d} instance {:d}: offset {:d} size {:d}, object length {:d}'.format(
+                obj, ins, offset, len(values), length))
+
+        pos = off + offset
+        end = pos + len(values)
+        delta = bytes(a ^ b for a, b in zip(data[pos:end], values))
+        data[pos:end] = values
+
+        object_crc = self.get('object_crc')
+        if object_crc is not None:
+            base = self.get_ext('object_crc_base', 0)
+            crc = crc24_calculate(delta, phase=pos - base)
+            object_crc[idx] ^= crc24_combine(crc, 0, off + length - end, phase=end - base)
+
+        start = self.get_ext('crc_start')
+        calculated_crc = self.calculated_crc()
+        if start is not None and calculated_crc is not None and pos >= start:
+            crc = crc24_calculate(delta, phase=pos - start)
+            calculated_crc ^= crc24_combine(crc, 0, len(data) - end, phase=end - start)
+            self.set_ext('calculated_crc', calculated_crc)
+
+        edited = self.get_ext('edited_objects', set())
+        edited.add((obj, ins))
+        self.set_ext('edited_objects', edited)
+
+        return calculated_crc
+
+    def apply_object_edits(self, content):
+        """Rewrite the data rows of objects changed by set_bytes from object_data.
+
+        Input:
+            content: Full xcfg file content as a list of lines.
+        Output:
+            New list of xcfg lines with the edited values.
+        """
+        return list(self.iter_object_edits(content))
+
+    def iter_object_edits(self, content):
+        """Lazily rewrite edited object rows, see apply_object_edits.
+
+        Input:
+            content: Iterable of xcfg lines.
+        Output:
+            Generator of xcfg lines with the edited values.
+        """
+        edited = self.get_ext('edited_objects', set())
+        title = self.get('object_title')
+        data = self.get('object_data')
+
+        base = None
+        for line, tag, result in self.lex(content):
+            if self.is_tag(tag):
+                base = None
+                if tag is self.T_OBJECT_DATA:
+                    key = (int(result.group(1)), int(result.group(2)))
+                    if key in edited:
+                        idx = self.find_object(*key)
+                        base = (title[idx].offset, title[idx].length)
+            elif base is not None:
+                if tag is self.D_OBJ_VALUE:
+                    offset = int(result.group(1))
+                    length = int(result.group(2))
+                    if offset + length <= base[1]:
+                        st = base[0] + offset
+                        value = int.from_bytes(data[st:st + length], 'little', signed=result.group(4).startswith('-'))
+                        text = line.rstrip('\r\n')
+                        line = '{:s}={:d}{:s}'.format(text.rsplit('=', 1)[0], value, line[len(text):])
+
+            yield line
+
 class XcfgCalculateCRC(object):
     """CRC24 calculator for config data extracted from XCFG/RAW sources."""
 
+    # CRC engine
+    (CRC_ENGINE_TABLE, CRC_ENGINE_REFERENCE, CRC_ENGINE_CHECK) = range(3)
+    engine = CRC_ENGINE_TABLE
+
+    # CRC start object priority: T14 > T71 > T7
+    START_OBJECT_ORDER = {14: 1, 71: 2, 7: 3}
+
     def __init__(self, xcfg):
         """Store the parser instance that supplies object/header data."""
         self.xcfg = xcfg
@@ -1218,8 +2046,8 @@ class XcfgCalculateCRC(object):
         return result
 
     @classmethod
-    def calculate_crc(cls, data, start_off=None, end_off=None):
-        """Calculate the CRC24 for a slice of byte data.
+    def __calculate_crc_reference(cls, data, start_off=None, end_off=None):
+        """Calculate the CRC24 bit by bit with the word-wise reference algorithm.
 
         Input:
             data: Byte list.
@@ -1229,9 +2057,7 @@ class XcfgCalculateCRC(object):
             24-bit CRC integer for the selected data window.
         """
 
-        ptr = data[start_off:end_off]
-
-        v.msg(v.DEBUG2, 'calcualte crc: st={} end={} len={}'.format(start_off, end_off, len(ptr)))
+        ptr = list(data[start_off:end_off])
 
         if not len(ptr):
             return 0
@@ -1248,6 +2074,88 @@ class XcfgCalculateCRC(object):
 
         return crc
 
+    @classmethod
+    def calculate_crc(cls, data, start_off=None, end_off=None, engine=None):
+        """Calculate the CRC24 for a slice of byte data.
+
+        Input:
+            data: Byte list or bytes-like object.
+            start_off: Optional start offset.
+            end_off: Optional exclusive end offset.
+            engine: Optional CRC_ENGINE_* selector, defaults to the class engine.
+        Output:
+            24-bit CRC integer for the selected data window.
+
+        Key steps:
+            1. CRC_ENGINE_TABLE runs the table-driven engine without copying bytes-like input.
+            2. CRC_ENGINE_REFERENCE runs the original word-by-word algorithm.
+            3. CRC_ENGINE_CHECK runs both and raises ValueError when they differ.
+        """
+
+        if engine is None:
+            engine = cls.engine
+
+        v.msg(v.DEBUG2, 'calcualte crc: st={} end={} len={}'.format(start_off, end_off, len(range(len(data))[start_off:end_off])))
+
+        if engine == cls.CRC_ENGINE_REFERENCE:
+            return cls.__calculate_crc_reference(data, start_off, end_off)
+
+        crc = crc24_calculate(data, start_off, end_off)
+
+        if engine == cls.CRC_ENGINE_CHECK:
+            crc_ref = cls.__calculate_crc_reference(data, start_off, end_off)
+            if crc != crc_ref:
+                raise ValueError('CRC engine mismatch: table={:06X}, reference={:06X}'.format(crc, crc_ref))
+
+        return crc
+
+    def object_crc(self, title, data, start):
+        """Return the per-object CRC cache with word phases relative to the CRC start.
+
+        Input:
+            title: Object title table.
+            data: Object data bytes.
+            start: Byte offset where the config CRC starts.
+        Output:
+            List of per-object CRC24 values aligned with the title rows.
+
+        Key steps:
+            1. Reuse the parser's 'object_crc' block when its base offset has the
+               same word phase as `start`.
+            2. Otherwise rehash every object with phase (offset - start) and store
+               the new cache back into the parser.
+        """
+        object_crc = self.xcfg.get('object_crc')
+        base = self.xcfg.get_ext('object_crc_base', 0)
+        if object_crc is not None and len(object_crc) == len(title) and not ((start - base) & 0x1):
+            return object_crc
+
+        object_crc = [crc24_calculate(data, row.offset, row.offset + row.length, phase=row.offset - start)
+                      for row in title]
+        self.xcfg.set('object_crc', object_crc)
+        self.xcfg.set_ext('object_crc_base', start)
+
+        return object_crc
+
+    def combine_object_crc(self, title, data, start):
+        """Assemble the config CRC from the per-object CRC cache.
+
+        Input:
+            title: Object title table.
+            data: Object data bytes.
+            start: Byte offset of the CRC start object.
+        Output:
+            24-bit CRC integer equal to calculate_crc(data, start).
+        """
+        object_crc = self.object_crc(title, data, start)
+
+        crc = 0
+        for row, crc_b in zip(title, object_crc):
+            if row.offset >= start:
+                crc = crc24_combine(crc, crc_b, row.length, phase=row.offset - start)
+
+        return crc
+
     def calculate(self):
         """Calculate the config CRC using the parser's object table and byte stream.
 
@@ -1258,7 +2166,8 @@ class XcfgCalculateCRC(object):
 
         Key steps:
             1. Find the CRC start object using the T14/T71/T7 priority rule.
-            2. Calculate CRC across object_data from that offset onward.
+            2. Assemble the CRC from the per-object CRC cache when the table engine
+               is active, otherwise calculate CRC across object_data from that offset onward.
             3. Compare the result with the stored header CRC for reporting.
         """
         header = self.xcfg.get('header_info')
@@ -1270,45 +2179,381 @@ class XcfgCalculateCRC(object):
         if title is None or data is None:
             return
 
-        v.msg(v.DEBUG, header.apply(lambda x: '{:02X}'.format(x)))
+        v.msg(v.DEBUG, header.hex_values())
         v.msg(v.DEBUG, title)
         v.msg(v.DEBUG, data)
 
         #search start position
         st_regs = {}
-        st_order = {14 : 1, 71 : 2, 7 : 3}  #priority: T14 > T71 > T7
-        for idx in title.index:
-            t_info = title.loc[idx]
-            if t_info['object'] in st_order.keys():
-                if t_info['instance'] == 0: #only store the 'start' at instance 0
-                    st_regs[t_info['object']] = t_info
+        st_order = self.START_OBJECT_ORDER
+        for t_info in title:
+            if t_info.object in st_order.keys():
+                if t_info.instance == 0: #only store the 'start' at instance 0
+                    st_regs[t_info.object] = t_info
 
         if not len(st_regs):
             v.msg(v.ERR, 'Missed {} object, not CRC calculated', st_order.keys())
             return
 
         st = sorted(st_regs, key=lambda x: st_order[x])[0]  # get first sorted object
-        start = st_regs[st]['offset']   #calculate from offset of raw data
-        v.msg(v.CONST, "Start address is T{}, addr {} offset {}".format(st, st_regs[st]['address'], start))
-        calculated_crc = self.calculate_crc(data, start)
-        matched = calculated_crc == header.loc[self.xcfg.INFO_BLOCK_NAME[self.xcfg.CHECKSUM]]
+        start = st_regs[st].offset   #calculate from offset of raw data
+        v.msg(v.CONST, "Start address is T{}, addr {} offset {}".format(st, st_regs[st].address, start))
+        if self.engine == self.CRC_ENGINE_TABLE:
+            calculated_crc = self.combine_object_crc(title, data, start)
+        else:
+            calculated_crc = self.calculate_crc(data, start)
+            if self.engine == self.CRC_ENGINE_CHECK:
+                combined_crc = self.combine_object_crc(title, data, start)
+                if combined_crc != calculated_crc:
+                    raise ValueError('Object CRC cache mismatch: combined={:06X}, calculated={:06X}'.format(combined_crc, calculated_crc))
+        matched = calculated_crc == header[self.xcfg.INFO_BLOCK_NAME[self.xcfg.CHECKSUM]]
 
         v.msg(v.CONST, 'CRC: calculate={:6X}, cfg={:6X} {:s}'.
               format(calculated_crc,
-                     header.loc[self.xcfg.INFO_BLOCK_NAME[self.xcfg.CHECKSUM]],
+                     header[self.xcfg.INFO_BLOCK_NAME[self.xcfg.CHECKSUM]],
                      '(matched)' if matched else '(mismatch) X X X'))
 
         self.calculated_crc = calculated_crc
+        self.xcfg.set_ext('crc_start', start)
 
         return calculated_crc
 
 
+class HeaderIndex(object):
+    """Read-only header DB indexed by the raw-export lookup signature.
+
+    Built once from the DB DataFrame and shared as-is by every XcfgBuildRawFile
+    (and, pickled once, by every batch worker). A lookup is one dict hit.
+    """
+
+    __slots__ = ('columns', 'keys', 'rows')
+
+    def __init__(self, columns, rows, keys):
+        """Index DB rows by their key columns.
+
+        Input:
+            columns: DB column names, RAW_INFO_BLOCK_NAME[:CHECKSUM].
+            rows: Iterable of DB rows aligned with columns.
+            keys: Column names forming the lookup signature.
+        Output:
+            None. The first row wins when a signature repeats, as with the
+            former DataFrame.query(...).iloc[0].
+        """
+        self.columns = tuple(columns)
+        self.keys = tuple(keys)
+        pos = [self.columns.index(name) for name in self.keys]
+        index = {}
+        for row in rows:
+            row = tuple(int(x) for x in row)
+            index.setdefault(tuple(row[i] for i in pos), row)
+        self.rows = index
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def from_frame(cls, db, keys=None):
+        """Build the index from a header DB DataFrame.
+
+        Input:
+            db: pandas.DataFrame with RAW_INFO_BLOCK_NAME[:CHECKSUM] columns.
+            keys: Lookup columns, XcfgBuildRawFile.LOOKUP_DB_TABLE by default.
+        Output:
+            HeaderIndex, or None when db is missing or has other columns.
+        """
+        columns = getattr(db, 'columns', None)
+        if columns is None:
+            return None
+
+        name1 = tuple(columns.values)
+        name2 = RawConfigParser.RAW_INFO_BLOCK_NAME[:RawConfigParser.CHECKSUM]
+        if name1 != name2:
+            v.msg(v.ERR, columns.values)
+            v.msg(v.ERR, RawConfigParser.RAW_INFO_BLOCK_NAME)
+            return None
+
+        if keys is None:
+            keys = XcfgBuildRawFile.LOOKUP_DB_TABLE
+
+        return cls(name1, db.itertuples(index=False, name=None), keys)
+
+    def lookup(self, header):
+        """Return the DB row matching a header as an InfoBlock, or None.
+
+        Input:
+            header: Mapping holding at least the key columns.
+        Output:
+            InfoBlock keyed by column name or None.
+        """
+        row = self.rows.get(tuple(header[name] for name in self.keys))
+        if row is None:
+            return None
+
+        return InfoBlock(zip(self.columns, row))
+
+class HeaderFile(object):
+    """Memory-mapped binary header DB ('.xdb'), sorted by the lookup signature.
+
+    Layout: a 16-byte file header (magic, format version, record size, record
+    count) followed by fixed 12-byte records. Each record starts with the
+    big-endian lookup key (FAMILY_ID, VARIANT, VERSION, BUILD, INFO_BLOCK_CHECKSUM),
+    so records sort as bytes and a lookup is a binary search on the mapping.
+    Nothing is parsed on open, and a pickled HeaderFile re-opens by path, so
+    pool workers share the OS page cache instead of a copy each.
+    """
+
+    EXTENSION = '.xdb'
+    MAGIC = b'MXDB'
+    FORMAT_VERSION = 1
+
+    HEADER = struct.Struct('<4sHHI4x')
+    RECORD = struct.Struct('>4BI3Bx')
+    KEY = struct.Struct('>4BI')
+
+    # record field order, as RAW_INFO_BLOCK_NAME indexes
+    FIELDS = (RawConfigParser.FAMILY_ID, RawConfigParser.VARIANT, RawConfigParser.VERSION, RawConfigParser.BUILD,
+              RawConfigParser.INFO_BLOCK_CHECKSUM, RawConfigParser.MATRIX_X, RawConfigParser.MATRIX_Y,
+              RawConfigParser.OBJECTS_NUM)
+
+    columns = RawConfigParser.RAW_INFO_BLOCK_NAME[:RawConfigParser.CHECKSUM]
+    keys = tuple(RawConfigParser.RAW_INFO_BLOCK_NAME[i] for i in FIELDS[:5])
+
+    def __init__(self, path):
+        """Map a binary header DB file.
+
+        Input:
+            path: '.xdb' file written by write().
+        Output:
+            None. Raises ValueError when the file is not a valid header DB.
+        """
+        self.path = path
+        self.mm = None
+        self.count = 0
+
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self.HEADER.size:
+                raise ValueError('Invalid header DB file: {:s}'.format(path))
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, count = self.HEADER.unpack_from(mm, 0)
+        if magic != self.MAGIC or version != self.FORMAT_VERSION or record_size != self.RECORD.size or \
+                size != self.HEADER.size + count * record_size:
+            mm.close()
+            raise ValueError('Invalid header DB file: {:s}'.format(path))
+
+        self.mm = mm
+        self.count = count
+
+    def __reduce__(self):
+        # workers map the file again rather than receiving its content
+        return (self.__class__, (self.path,))
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Release the mapping."""
+        if getattr(self, 'mm', None) is not None:
+            self.mm.close()
+            self.mm = None
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, idx):
+        """Return record idx as a tuple in RAW_INFO_BLOCK_NAME[:CHECKSUM] order."""
+        if idx < 0:
+            idx += self.count
+        if not 0 <= idx < self.count:
+            raise IndexError(idx)
+
+        return self.unpack(self.RECORD.unpack_from(self.mm, self.HEADER.size + idx * self.RECORD.size))
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    @classmethod
+    def pack(cls, row):
+        """Pack one DB row (RAW_INFO_BLOCK_NAME[:CHECKSUM] order) into a record.
+
+        Input:
+            row: Sequence of 8 integers.
+        Output:
+            Record bytes. Raises ValueError when a value does not fit its field.
+        """
+        try:
+            return cls.RECORD.pack(*[int(row[i]) for i in cls.FIELDS])
+        except (struct.error, TypeError, IndexError) as e:
+            raise ValueError('Invalid header DB row {}: {:s}'.format(list(row), str(e)))
+
+    @classmethod
+    def unpack(cls, fields):
+        """Reorder unpacked record fields into RAW_INFO_BLOCK_NAME[:CHECKSUM] order."""
+        row = [0] * len(cls.FIELDS)
+        for i, val in zip(cls.FIELDS, fields):
+            row[i] = val
+
+        return tuple(row)
+
+    def find(self, key):
+        """Return the index of the first record whose key is not below key."""
+        lo, hi = 0, self.count
+        base, size, width = self.HEADER.size, self.RECORD.size, self.KEY.size
+        mm = self.mm
+        while lo < hi:
+            mid = (lo + hi) // 2
+            off = base + mid * size
+            if mm[off:off + width] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    def lookup(self, header):
+        """Return the DB row matching a header as an InfoBlock, or None.
+
+        Input:
+            header: Mapping holding at least the key columns.
+        Output:
+            InfoBlock keyed by column name or None. With repeated keys the
+            first row of the source DB wins, as in HeaderIndex.
+        """
+        try:
+            key = self.KEY.pack(*[int(header[name]) for name in self.keys])
+        except struct.error:
+            return None
+
+        i = self.find(key)
+        if i >= self.count:
+            return None
+
+        off = self.HEADER.size + i * self.RECORD.size
+        if self.mm[off:off + self.KEY.size] != key:
+            return None
+
+        return InfoBlock(zip(self.columns, self[i]))
+
+    @classmethod
+    def write(cls, path, rows):
+        """Write DB rows as a sorted binary header DB, replacing path atomically.
+
+        Input:
+            path: Destination '.xdb' file.
+            rows: Iterable of rows in RAW_INFO_BLOCK_NAME[:CHECKSUM] order.
+        Output:
+            Number of records written. The sort is stable, so rows sharing a
+            key keep their source order.
+        """
+        records = sorted((cls.pack(row) for row in rows), key=lambda rec: rec[:cls.KEY.size])
+        with open(path + '.tmp', 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.FORMAT_VERSION, cls.RECORD.size, len(records)))
+            f.write(b''.join(records))
+        os.replace(path + '.tmp', path)
+
+        return len(records)
+
+    @classmethod
+    def read_csv(cls, path):
+        """Read the rows of a CSV header DB without pandas.
+
+        Input:
+            path: CSV file with a RAW_INFO_BLOCK_NAME[:CHECKSUM] header line.
+        Output:
+            List of row tuples. Rows with an empty field are dropped, as by
+            RawConfigScanner.load().
+        """
+        rows = []
+        with open(path, newline='') as f:
+            reader = csv.DictReader(f)
+            if tuple(reader.fieldnames or ()) != cls.columns:
+                raise ValueError('Invalid header DB columns: {}'.format(reader.fieldnames))
+
+            for row in reader:
+                values = [row[name] for name in cls.columns]
+                if all(values):
+                    rows.append(tuple(int(float(x)) for x in values))
+
+        return rows
+
+    @classmethod
+    def write_csv(cls, path, rows):
+        """Write DB rows as a CSV header DB, the layout RawConfigScanner.save() uses."""
+        with open(path + '.tmp', 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(cls.columns)
+            writer.writerows(rows)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def is_binary(cls, path):
+        """Whether path names a binary header DB, by its extension."""
+        return os.path.splitext(path)[1].lower() == cls.EXTENSION
+
+    @classmethod
+    def convert(cls, src, dst):
+        """Convert a header DB between the CSV and binary formats.
+
+        Input:
+            src: Source DB, '.xdb' or CSV.
+            dst: Destination DB, '.xdb' or CSV.
+        Output:
+            Number of rows written. Every row is kept; a binary DB lists them
+            in lookup-key order.
+        """
+        if cls.is_binary(src):
+            db = cls(src)
+            rows = list(db)
+            db.close()
+        else:
+            rows = cls.read_csv(src)
+
+        if cls.is_binary(dst):
+            return cls.write(dst, rows)
+
+        cls.write_csv(dst, rows)
+        return len(rows)
+
+def load_header_db(path):
+    """Load a header DB for raw export lookups.
+
+    Input:
+        path: '.xdb' binary DB or CSV DB.
+    Output:
+        HeaderFile mapped from a binary DB, HeaderIndex built from a CSV DB,
+        or None when the DB cannot be loaded.
+    """
+    if HeaderFile.is_binary(path):
+        try:
+            return HeaderFile(path)
+        except (OSError, ValueError) as e:
+            v.msg(v.ERR, 'Unable to load db file: {:s}, Error = {:s}'.format(path, str(e)))
+            return None
+
+    return HeaderIndex.from_frame(RawConfigScanner().load(path))
+
 class XcfgBuildRawFile(object):
     """Convert parsed xcfg content into raw-file text output."""
 
     PAYLOAD_OBJECT = 68
     PAYLOAD_INSTANCE = 0x800D
 
+    # binary image
+    BIN_MAGIC = b'OBPB'
+    BIN_FORMAT_VERSION = 1
+    BIN_HEADER = struct.Struct('<4sBBH')
+    BIN_RECORD = struct.Struct('<HHH')
+    IMAGE_FORMATS = ('bin', 'hex')
+
+    # Intel-HEX image
+    HEX_RECORD_SIZE = 16
+    HEX_EOF = b':00000001FF\n'
+
+    # prompt for MATRIX_X/Y when the DB has no match, batch runs turn this off
+    interactive = True
+
     LOOKUP_DB_TABLE = [
         XcfgConfigParser.INFO_BLOCK_NAME[XcfgConfigParser.FAMILY_ID],
         XcfgConfigParser.INFO_BLOCK_NAME[XcfgConfigParser.VARIANT],
@@ -1320,65 +2565,55 @@ class XcfgBuildRawFile(object):
         """Store the parsed xcfg source and initialize optional DB state."""
         self.xcfg = xcfg
         self.db = None
+        self.raw_head = None
+        self.raw_info = None
 
     def load_db(self, db):
         """Load an info-block lookup database used to fill raw header metadata.
 
         Input:
-            db: pandas.DataFrame with raw header columns.
+            db: HeaderIndex or HeaderFile, shared without copying, or a
+                pandas.DataFrame with raw header columns that is indexed here.
         Output:
-            None. Stores a validated copy of the database.
+            None. Stores the index when it holds any row.
         """
 
-        if not isinstance(db, pd.DataFrame):
+        if db is None:
             return
 
-        name1 = tuple(db.columns.values)
-        name2 = RawConfigParser.RAW_INFO_BLOCK_NAME[:RawConfigParser.CHECKSUM]
-        if name1 != name2:
-            v.msg(v.ERR, db.columns.values)
-            v.msg(v.ERR, RawConfigParser.RAW_INFO_BLOCK_NAME)
-            return
+        if not isinstance(db, (HeaderIndex, HeaderFile)):
+            db = HeaderIndex.from_frame(db, self.LOOKUP_DB_TABLE)
 
-        if len(db.index):
-            self.db = db.copy()
+        if db is not None and len(db):
+            self.db = db
 
     def lookup_db(self, header):
         """Find a matching DB row for the current header signature.
 
         Input:
-            header: Parsed xcfg header series.
+            header: Parsed xcfg header block.
         Output:
-            Matching pandas row or None when no row matches.
+            Matching InfoBlock row or None when no row matches.
         """
 
         if self.db is None:
             return
 
-        cond = []
-        for item in self.LOOKUP_DB_TABLE:
-            cond.append('{:s}=={:d}'.format(item, header.loc[item]))
-
-        words = ' & '.join(cond)
-        v.msg(v.DEBUG, words)
-        result = self.db.query(words)
-        if len(result):
-            return result.iloc[0]
-        else:
-            return None
+        return self.db.lookup(header)
 
     def get_extra_info(self, header):
         """Resolve MATRIX_X/Y and object count for raw-header generation.
 
         Input:
-            header: Parsed xcfg header series.
+            header: Parsed xcfg header block.
         Output:
             Tuple of (matrix_x, matrix_y, objects_num).
 
         Key steps:
             1. Prefer version-header extension data already present in the xcfg.
             2. Fall back to the scanned database when available.
-            3. Prompt the user only when metadata still cannot be resolved.
+            3. Prompt the user only when metadata still cannot be resolved,
+               or raise ValueError when interactive is off.
         """
 
         # from header info ext first
@@ -1389,10 +2624,14 @@ class XcfgBuildRawFile(object):
         result = self.lookup_db(header)
         if result is not None:
             #print(result.apply(lambda x: '{:02X}'.format(x)))
-            ext = result.loc[RawConfigParser.RAW_INFO_BLOCK_NAME[RawConfigParser.MATRIX_X]], result.loc[RawConfigParser.RAW_INFO_BLOCK_NAME[RawConfigParser.MATRIX_Y]], result.loc[RawConfigParser.RAW_INFO_BLOCK_NAME[RawConfigParser.OBJECTS_NUM]]
+            ext = result[RawConfigParser.RAW_INFO_BLOCK_NAME[RawConfigParser.MATRIX_X]], result[RawConfigParser.RAW_INFO_BLOCK_NAME[RawConfigParser.MATRIX_Y]], result[RawConfigParser.RAW_INFO_BLOCK_NAME[RawConfigParser.OBJECTS_NUM]]
         else:
+            if not self.interactive:
+                raise ValueError('No database entry for {:s}, MATRIX_X/Y unknown'.format(
+                    ' '.join('{:s}={:s}'.format(k, x) for k, x in header.hex_values().items())))
+
             ext = [0, 0]
-            v.msg(v.WARN, header.apply(lambda x: '{:02X}'.format(x)))
+            v.msg(v.WARN, header.hex_values())
             v.msg(v.WARN, 'Please input the MATRIX_X/Y, format is <x, y>: ')
             v.msg(v.WARN, '## e.g. For \'336T\', input: 24,14')
             try:
@@ -1465,14 +2704,33 @@ class XcfgBuildRawFile(object):
             List of raw text lines representing payload records.
 
         Key steps:
-            1. Read parsed payload bytes from the xcfg parser.
-            2. Append a separator byte and big-endian payload checksum bytes.
-            3. Emit the dedicated T68 raw pseudo-record format.
+            1. Build the payload record bytes with payload_records().
+            2. Emit the dedicated T68 raw pseudo-record format.
         """
-        sections = self.xcfg.payload_sections([])
         lines = []
-        for section in sections:
-            payload = list(section.get('data', []))
+        for payload in self.payload_records():
+            trunk = [
+                '{:04X}'.format(self.PAYLOAD_OBJECT),
+                '{:04X}'.format(self.PAYLOAD_INSTANCE),
+                '{:04X}'.format(len(payload)),
+                payload.hex(' ').upper(),
+            ]
+            lines.append(' '.join(trunk))
+
+        return lines
+
+    def payload_records(self):
+        """Return the T68 pseudo-record bytes of every non-empty payload section.
+
+        Input:
+            None.
+        Output:
+            List of bytearray: payload, a separator byte and the big-endian
+            payload checksum.
+        """
+        records = []
+        for section in self.xcfg.payload_sections([]):
+            payload = bytearray(section.get('data', b''))
             if not payload:
                 continue
 
@@ -1483,50 +2741,47 @@ class XcfgBuildRawFile(object):
                 (checksum >> 8) & 0xff,
                 checksum & 0xff,
             ])
+            records.append(payload)
 
-            trunk = [
-                '{:04X}'.format(self.PAYLOAD_OBJECT),
-                '{:04X}'.format(self.PAYLOAD_INSTANCE),
-                '{:04X}'.format(len(payload)),
-                ' '.join('{:02X}'.format(x) for x in payload),
-            ]
-            lines.append(' '.join(trunk))
-
-        return lines
+        return records
 
     def rebuild_raw_header_block(self, data, matrix_x, matrix_y, object_num):
         """Build the compact raw-header payload line.
 
         Input:
-            data: Parsed xcfg header series.
+            data: Parsed xcfg header block.
             matrix_x: Resolved X matrix size.
             matrix_y: Resolved Y matrix size.
             object_num: Resolved raw object count.
         Output:
-            pandas.Series representing the raw header block.
+            InfoBlock representing the raw header block.
         """
 
-        data_new = list(data[:RawConfigParser.BUILD + 1])
+        data_new = list(data.values())[:RawConfigParser.BUILD + 1]
         data_new.extend([matrix_x, matrix_y, object_num])
 
-        info_block = pd.Series(data=data_new, index=RawConfigParser.RAW_INFO_BLOCK_NAME[:len(data_new)])
+        info_block = InfoBlock(zip(RawConfigParser.RAW_INFO_BLOCK_NAME, data_new))
 
         return info_block
 
     def rebuild_raw_data(self, output_ver=None):
-        """Build the full raw file content from the parsed xcfg.
+        """Resolve the raw file header lines from the parsed xcfg.
 
         Input:
             output_ver: CLI selector or None.
         Output:
-            None. Stores generated text lines into self.raw_content.
+            None. Stores the header lines into self.raw_head; the object records
+            are generated by iter_raw_content() while they are written.
 
         Key steps:
             1. Resolve the effective raw output version.
-            2. Emit version-specific raw headers and metadata lines.
-            3. Append object records and optional payload records.
+            2. Emit version-specific raw headers and metadata lines, resolving
+               MATRIX_X/Y here so a missing DB entry fails before any output.
         """
 
+        self.raw_head = None
+        self.raw_info = None
+
         xcfg = self.xcfg
         header = xcfg.get('header_info')
         if header is None:
@@ -1540,9 +2795,10 @@ class XcfgBuildRawFile(object):
         if data is None:
             return
 
-        v.msg(v.DEBUG, header.apply(lambda x: '{:02X}'.format(x)))
-        v.msg(v.DEBUG, title)
-        v.msg(v.DEBUG, data)
+        if v.v_level >= v.DEBUG:
+            v.msg(v.DEBUG, header.hex_values())
+            v.msg(v.DEBUG, title)
+            v.msg(v.DEBUG, data)
 
         lines = []
         raw_ver = self.output_version(output_ver)
@@ -1565,7 +2821,8 @@ class XcfgBuildRawFile(object):
 
         extra = self.get_extra_info(header)
         raw_header_block = self.rebuild_raw_header_block(header, *extra)
-        raw = ' '.join('{:02X}'.format(x) for x in raw_header_block)
+        self.raw_info = raw_header_block
+        raw = ' '.join('{:02X}'.format(x) for x in raw_header_block.values())
         lines.append(raw)
         #RAW_INFO_BLOCK_CRC
         raw = '{:06X}'.format(self.xcfg.info_crc(0))
@@ -1577,65 +2834,77 @@ class XcfgBuildRawFile(object):
 
         if raw_ver >= RawConfigParser.RAW_VERSION_4:
             lines.append('[DEVICE_0]')
-        #RAW_CONFIG_DATA
 
-        payload_lines = self.payload_lines()
-        for idx in title.index:
-            info = title.loc[idx]
-
-            trunk = []
-            raw = '{:04X}'.format(info['object'])
-            trunk.append(raw)
-            raw = '{:04X}'.format(info['instance'])
-            trunk.append(raw)
-            raw = '{:04X}'.format(info['length'])
-            trunk.append(raw)
+        self.raw_head = lines
+
+        # only materialized when it is going to be printed
+        if v.v_level >= v.INFO:
+            v.msg(v.INFO, '\n'.join(self.iter_raw_content()))
+
+    def iter_raw_content(self):
+        """Yield the raw file lines, header first, without building them all at once.
+
+        Input:
+            None. rebuild_raw_data() must have resolved the header.
+        Output:
+            Generator of text lines without line endings.
+
+        Key steps:
+            1. Yield the header lines from rebuild_raw_data().
+            2. Hex-encode each object slice of the config data in one call.
+            3. Append the payload records at the end.
+        """
+        if self.raw_head is None:
+            return
+
+        yield from self.raw_head
+
+        #RAW_CONFIG_DATA
+        data = self.xcfg.get('object_data')
+        view = memoryview(data)
+        for info in self.xcfg.get('object_title'):
             st = info['offset']
             end = info['offset'] + info['length']
             if end > len(data):
                 print("Too long data request: ", info, len(data))
-            raw = ' '.join('{:02X}'.format(x) for x in data[st: end])
-            trunk.append(raw)
-            lines.append(' '.join(trunk))
+            yield '{:04X} {:04X} {:04X} {:s}'.format(info['object'], info['instance'], info['length'],
+                                                     view[st:end].hex(' ').upper())
 
         # Keep payload-type T68 data at the end of RAW output.
-        if payload_lines:
-            lines.extend(payload_lines)
+        yield from self.payload_lines()
 
-        v.msg(v.INFO, '\n'.join(lines))
-        self.raw_content = lines
-
-    def save_raw_file(self, output, path=None):
-        """Write the generated raw content to a timestamped output file.
+    def output_filename(self, output, path=None, ext='raw'):
+        """Build the timestamped output file name of a raw or image export.
 
         Input:
             output: CLI selector or None.
             path: Optional base path used to derive output directory/name.
+            ext: Output file extension.
         Output:
-            None. Writes a raw text file when raw_content is available.
+            Output path; an existing file of that name is removed.
         """
         xcfg = self.xcfg
-        if xcfg is None:
-            return
 
         if not path:
             path = xcfg.get_path()
 
+        if not path:
+            raise ValueError('No file name for the {:s} output, pass a path or use dumps()'.format(ext))
+
         dir = os.path.dirname(path)
         name = os.path.basename(path)
 
         if not dir:
-            dir = os.path.dirname(xcfg.get_path())
+            dir = os.path.dirname(xcfg.get_path() or '')
 
         if not dir:
             dir = os.getcwd()
 
         if not name:
-            name = os.path.basename(xcfg.get_path())
+            name = os.path.basename(xcfg.get_path() or '')
 
         raw = name.rsplit('.', 1)
         main = raw[0]
-        ext = 'raw'
         raw_ver = self.output_version(output)
 
         now = datetime.datetime.now()
@@ -1645,42 +2914,232 @@ class XcfgBuildRawFile(object):
         if os.path.exists(filename):
             os.remove(filename)
 
-        with open(filename, 'w') as outfile:
-            outfile.write('\n'.join(self.raw_content))
-            outfile.write('\n')
-            outfile.close()
+        return filename
+
+    def save_raw_file(self, output, path=None):
+        """Write the generated raw content to a timestamped output file.
+
+        Input:
+            output: CLI selector or None.
+            path: Optional base path used to derive output directory/name.
+        Output:
+            Path of the written raw file, or None without a parsed xcfg or
+            a resolved raw header.
+        """
+        xcfg = self.xcfg
+        if xcfg is None or self.raw_head is None:
+            return
+
+        filename = self.output_filename(output, path, 'raw')
+
+        with open(filename, 'w', buffering=1 << 16) as outfile:
+            outfile.writelines(line + '\n' for line in self.iter_raw_content())
             v.msg(v.CONST, 'Save raw file to: {:s}'.format(filename))
 
+        return filename
+
+    def dumps(self):
+        """Return the raw file content that save_raw_file() would write.
+
+        Input:
+            None. rebuild_raw_data() must have resolved the header.
+        Output:
+            bytes of the raw file, or None without a parsed xcfg or a resolved
+            raw header.
+        """
+        if self.xcfg is None or self.raw_head is None:
+            return None
+
+        return ''.join(line + '\n' for line in self.iter_raw_content()).encode('utf-8')
+
+    def image_records(self):
+        """Return the (object, instance, data view) records of the raw file in order.
+
+        Input:
+            None.
+        Output:
+            List of tuples, data views point into object_data; the T68
+            payload records come last.
+        """
+        data = self.xcfg.get('object_data')
+        view = memoryview(data)
+        records = [(info.object, info.instance, view[info.offset:info.offset + info.length])
+                   for info in self.xcfg.get('object_title')]
+        records.extend((self.PAYLOAD_OBJECT, self.PAYLOAD_INSTANCE, memoryview(payload))
+                       for payload in self.payload_records())
+
+        return records
+
+    def save_bin_file(self, output, path=None):
+        """Write the raw content as a packed binary image.
+
+        Input:
+            output: CLI selector or None.
+            path: Optional base path used to derive output directory/name.
+        Output:
+            Path of the written file, or None without a resolved raw header.
+
+        Layout, multi-byte fields little-endian:
+            BIN_HEADER: magic 'OBPB', BIN_FORMAT_VERSION, raw version, record count
+            RAW_INFO_BLOCK: FAMILY_ID .. OBJECTS_NUM, 7 bytes
+            INFO_BLOCK_CHECKSUM and CHECKSUM, 3 bytes each
+            records: BIN_RECORD (object, instance, length) then the object bytes
+        """
+        if self.xcfg is None or self.raw_info is None:
+            return
+
+        records = self.image_records()
+        head = self.BIN_HEADER.pack(self.BIN_MAGIC, self.BIN_FORMAT_VERSION, self.output_version(output), len(records))
+        head += bytes(list(self.raw_info.values()))
+        head += self.xcfg.info_crc(0).to_bytes(3, 'little') + self.xcfg.calculated_crc(0).to_bytes(3, 'little')
+
+        size = len(head) + sum(self.BIN_RECORD.size + len(data) for _, _, data in records)
+        filename = self.output_filename(output, path, 'bin')
+        with mapped_output(filename, size) as mm:
+            mm[:len(head)] = head
+            pos = len(head)
+            for obj, ins, data in records:
+                self.BIN_RECORD.pack_into(mm, pos, obj, ins, len(data))
+                pos += self.BIN_RECORD.size
+                mm[pos:pos + len(data)] = data
+                pos += len(data)
+
+        v.msg(v.CONST, 'Save bin file to: {:s}'.format(filename))
+
+        return filename
+
+    def save_hex_file(self, output, path=None):
+        """Write the object data as an Intel-HEX image placed by OBJECT_ADDRESS.
+
+        Input:
+            output: CLI selector or None.
+            path: Optional base path used to derive output directory/name.
+        Output:
+            Path of the written file. Raises ValueError when the objects carry
+            no address (xcfg sources converted from raw) or overlap.
+
+        Key steps:
+            1. Cut every object into data records of at most HEX_RECORD_SIZE bytes
+               that do not cross a 64K segment.
+            2. Size the file from the record layout and fill a memory-mapped file,
+               with an extended linear address record at every segment change.
+        """
+        xcfg = self.xcfg
+        if xcfg is None:
+            return
+
+        title = xcfg.get('object_title')
+        data = xcfg.get('object_data')
+        if title is None or data is None:
+            return
+
+        rows = [info for info in title if info.length]
+        for info in rows:
+            if info.address is None:
+                raise ValueError('Object T{:d} has no OBJECT_ADDRESS for a HEX image'.format(info.object))
+        rows.sort(key=lambda info: info.address)
+
+        # (segment or None, address, offset, length) per line
+        lines = []
+        segment = None
+        end = 0
+        for info in rows:
+            if info.address < end:
+                raise ValueError('Object T{:d} instance {:d} overlaps at address {:d}'.format(info.object, info.instance, info.address))
+            end = info.address + info.length
+
+            addr, off = info.address, info.offset
+            while addr < end:
+                if addr >> 16 != segment:
+                    segment = addr >> 16
+                    lines.append((segment, 0, 0, 0))
+                n = min(self.HEX_RECORD_SIZE, end - addr, 0x10000 - (addr & 0xFFFF))
+                lines.append((None, addr & 0xFFFF, off, n))
+                addr += n
+                off += n
+
+        # ':' + (count, address, type, data, checksum) as hex + '\n'
+        size = sum(2 * (5 + (2 if seg is not None else n)) + 2 for seg, _, _, n in lines) + len(self.HEX_EOF)
+        view = memoryview(data)
+        filename = self.output_filename(output, path, 'hex')
+        with mapped_output(filename, size) as mm:
+            pos = 0
+            for seg, addr, off, n in lines:
+                if seg is not None:
+                    record = bytes((2, 0, 0, 4, seg >> 8, seg & 0xFF))
+                else:
+                    record = bytes((n, addr >> 8, addr & 0xFF, 0)) + view[off:off + n]
+                record += bytes(((-sum(record)) & 0xFF,))
+                line = b':' + record.hex().upper().encode() + b'\n'
+                mm[pos:pos + len(line)] = line
+                pos += len(line)
+            mm[pos:] = self.HEX_EOF
+
+        v.msg(v.CONST, 'Save hex file to: {:s}'.format(filename))
+
+        return filename
+
+    def save_image_file(self, image, output, path=None):
+        """Write a 'bin' or 'hex' image, see save_bin_file() and save_hex_file()."""
+        if image == 'bin':
+            return self.save_bin_file(output, path)
+        if image == 'hex':
+            return self.save_hex_file(output, path)
+
+        raise ValueError('Un-support image format \'{}\''.format(image))
+
 class RawConfigScanner(RawConfigParser):
     """Scan directories of raw files to build and maintain the header database."""
 
+    # ask which row to keep on a header conflict, watch mode turns this off
+    interactive = True
+
     PARAM = {'db_file': 'db_header.csv',
                 'max_scan_files': 5000,
+                'scan_jobs': 0,             # header reader processes, 0 for one per CPU
+                'scan_parallel_min': 64,    # fewer files are read in-process
+                'manifest': True,           # reuse headers of unchanged files from <db>.manifest.csv
                 'db_col': RawConfigParser.RAW_INFO_BLOCK_NAME[:RawConfigParser.CHECKSUM]}
 
     def __init__(self):
-        """Initialize the scanner, parser helper, and in-memory database."""
+        """Initialize the scanner, parser helper, and in-memory database.
+
+        pandas is imported here rather than at module level, so parsing and CRC
+        paths that never touch the database do not pay its import cost.
+        """
+        import pandas as pd
+
         super(RawConfigScanner, self).__init__()
         self.parser = RawConfigParser(method=RawConfigParser.PARSE_HEADER)
         self.db = pd.DataFrame(columns=self.PARAM['db_col'])
         self.db_file = os.path.join(os.getcwd(), self.PARAM['db_file'])
         self.db_new = False
+        self.manifest = None    # scanned manifest not written yet, see save()
 
     def load(self, path=None):
-        """Load the CSV header database from disk.
+        """Load the CSV or binary ('.xdb') header database from disk.
 
         Input:
-            path: Optional override path to the CSV database file.
+            path: Optional override path to the database file.
         Output:
             pandas.DataFrame or None when loading fails.
         """
+        import pandas as pd
+
         try:
             if path is not None:
                 self.db_file = path
 
-            db = pd.read_csv(self.db_file)
-            db.dropna(axis=0, how='any', inplace=True)
+            if HeaderFile.is_binary(self.db_file):
+                hf = HeaderFile(self.db_file)
+                db = pd.DataFrame(list(hf), columns=self.PARAM['db_col'])
+                hf.close()
+            else:
+                db = pd.read_csv(self.db_file)
+                db.dropna(axis=0, how='any', inplace=True)
             self.db = db
+            # headers merged by an unsaved scan are gone with the old DB
+            self.manifest = None
 
             return db
         except Exception as e:
@@ -1692,12 +3151,16 @@ class RawConfigScanner(RawConfigParser):
         Input:
             None.
         Output:
-            None. Writes the CSV file only when db_new is True.
+            None. Writes the DB file, CSV or binary by its extension, only
+            when db_new is True; the pending scan manifest is written after
+            the DB, so a failed save leaves the new files to the next scan.
         """
 
         if not self.db_new:
             return
 
+        import pandas as pd
+
         if not isinstance(self.db, pd.DataFrame):
             return
 
@@ -1706,15 +3169,79 @@ class RawConfigScanner(RawConfigParser):
                 self.db.drop_duplicates(keep='first', inplace=True)
                 self.db.dropna(axis=0)
                 if len(self.db):
-                    self.db.to_csv(self.db_file, sep=',', index=False)
+                    if HeaderFile.is_binary(self.db_file):
+                        HeaderFile.write(self.db_file, self.db.astype(int).values.tolist())
+                    else:
+                        self.db.to_csv(self.db_file, sep=',', index=False)
                     v.msg(v.CONST, 'Save db to file: {:s}'.format(self.db_file))
+                    self.save_manifest()
             except Exception as e:
                 v.msg(v.ERR, 'Unable to save db file: {:s}, Error = {:s}'.format(self.db_file, str(e)))
             finally:
-                v.msg(v.INFO, self.db.applymap(lambda x: '{:02X}'.format(x)))
+                if v.v_level >= v.INFO:
+                    v.msg(v.INFO, self.db.astype(int).apply(lambda col: col.map('{:02X}'.format)))
 
         self.db_new = False
 
+    def manifest_file(self):
+        """Return the scan manifest path, stored next to the DB file."""
+        return os.path.splitext(self.db_file)[0] + '.manifest.csv'
+
+    def load_manifest(self):
+        """Load the scan manifest written by the previous scan.
+
+        Input:
+            None.
+        Output:
+            Dictionary of absolute path -> (size, mtime_ns, sha256, header list or None).
+            An unreadable manifest is reported and treated as empty.
+        """
+        manifest = {}
+        path = self.manifest_file()
+        if not os.path.exists(path):
+            return manifest
+
+        names = self.PARAM['db_col']
+        try:
+            with open(path, newline='') as f:
+                for row in csv.DictReader(f):
+                    header = None
+                    if row[names[0]]:
+                        header = [int(row[name]) for name in names]
+                    manifest[row['path']] = (int(row['size']), int(row['mtime_ns']), row['sha256'], header)
+        except Exception as e:
+            v.msg(v.ERR, 'Unable to load manifest file: {:s}, Error = {:s}'.format(path, str(e)))
+            return {}
+
+        return manifest
+
+    def save_manifest(self, manifest=None):
+        """Write the scan manifest, replacing the old file atomically.
+
+        Input:
+            manifest: Dictionary as returned by load_manifest(), the pending
+                manifest of the last scan() when omitted.
+        Output:
+            None.
+        """
+        if manifest is None:
+            manifest, self.manifest = self.manifest, None
+            if manifest is None:
+                return
+
+        path = self.manifest_file()
+        names = self.PARAM['db_col']
+        try:
+            with open(path + '.tmp', 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(('path', 'size', 'mtime_ns', 'sha256') + tuple(names))
+                for name in sorted(manifest):
+                    size, mtime, digest, header = manifest[name]
+                    writer.writerow([name, size, mtime, digest] + (header if header is not None else [''] * len(names)))
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            v.msg(v.ERR, 'Unable to save manifest file: {:s}, Error = {:s}'.format(path, str(e)))
+
     def __search_header_in_dirs(self, path, limited=0):
         """Search a directory tree for raw files and extract header blocks.
 
@@ -1722,37 +3249,95 @@ class RawConfigScanner(RawConfigParser):
             path: Directory path to scan.
             limited: Unused placeholder for future scan limiting.
         Output:
-            Tuple of (header_block_list, file_path_list).
+            Tuple of (header_block_list, file_path_list, manifest). With the manifest
+            enabled only new or changed files are returned, unless the DB is empty;
+            manifest is None when disabled.
+
+        Key steps:
+            1. Walk the tree and collect the raw file names.
+            2. Reuse the manifest header of files with the same size/mtime, or with
+               the same content hash (moved or touched files).
+            3. Read only the header lines of the remaining files, across a process
+               pool when there are at least PARAM['scan_parallel_min'] of them.
+            4. Return the manifest, dropping entries of files deleted under the path.
+               It is written once the headers are persisted, see scan().
         """
 
-        header_blocks = []
-        paths = []
-        i = 0
-        for root, dirs, files in os.walk(path, topdown=True):
+        root = os.path.abspath(path)
+        candidates = []
+        for root_dir, dirs, files in os.walk(root, topdown=True):
             for name in files:
                 raw = name.split('.')
                 if 'rebuild' not in raw and 'raw' == raw[-1]:
-                    if 'rebuild' in raw:
-                        v.msg(v.INFO, 'skip rebuild file: {:s}({:s})'.format(name, root))
-                    else:
-                        path = os.path.join(root, name)
-                        try:
-                            self.parser.load(path)
-                            info = self.parser.get('header_info')
-                            if info is not None:
-                                #header_info = list(info).append(path)
-                                header_info = info[:self.INFO_BLOCK_CHECKSUM + 1]
-                                header_blocks.append(header_info)
-                                paths.append(path)
-                        except Exception as e:
-                            v.msg(v.ERR, 'Parse failed: {:s}'.format(str(e)))
-                        finally:
-                            self.clear()
+                    candidates.append(os.path.join(root_dir, name))
+                elif 'rebuild' in raw and 'raw' == raw[-1]:
+                    v.msg(v.INFO, 'skip rebuild file: {:s}({:s})'.format(name, root_dir))
 
             #for name in dirs:
                 #print('scan dirs: {:s}'.format(os.path.join(root, name)))
 
-        return header_blocks, paths
+        use_manifest = self.PARAM['manifest']
+        old = {}
+        if use_manifest:
+            # a scan not saved yet already merged its files into self.db
+            old = self.manifest if self.manifest is not None else self.load_manifest()
+        by_digest = {entry[2]: entry for entry in old.values()}
+        # entries outside the scanned tree are kept as they are
+        prefix = os.path.join(root, '')
+        manifest = {name: entry for name, entry in old.items() if not name.startswith(prefix)}
+
+        todo = []
+        for name in candidates:
+            try:
+                st = os.stat(name)
+            except OSError:
+                continue
+
+            entry = old.get(name)
+            if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+                manifest[name] = entry
+                continue
+
+            digest = file_digest(name) if use_manifest else ''
+            entry = by_digest.get(digest)
+            if entry is not None:
+                manifest[name] = (st.st_size, st.st_mtime_ns, digest, entry[3])
+                continue
+
+            todo.append((name, st.st_size, st.st_mtime_ns, digest))
+
+        names = [item[0] for item in todo]
+        jobs = self.PARAM['scan_jobs'] or os.cpu_count() or 1
+        if jobs > 1 and len(names) >= self.PARAM['scan_parallel_min']:
+            chunksize = max(1, len(names) // (jobs * 8))
+            with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+                results = list(executor.map(read_raw_header, names, chunksize=chunksize))
+        else:
+            results = map(read_raw_header, names)
+
+        fresh = set()
+        for (name, size, mtime, digest), (header_info, error) in zip(todo, results):
+            if error is not None:
+                v.msg(v.ERR, 'Parse failed: {:s}'.format(error))
+            manifest[name] = (size, mtime, digest, header_info)
+            fresh.add(name)
+
+        if use_manifest:
+            v.msg(v.INFO, 'scan {:d} raw files, {:d} read, {:d} from manifest'.format(
+                len(candidates), len(fresh), len(candidates) - len(fresh)))
+
+        # an empty DB (e.g. the CSV was removed) takes every known header again
+        merge_all = not use_manifest or not len(self.db.index)
+
+        header_blocks = []
+        paths = []
+        for name in candidates:
+            entry = manifest.get(name)
+            if entry is not None and entry[3] is not None and (merge_all or name in fresh):
+                header_blocks.append(entry[3])
+                paths.append(name)
+
+        return header_blocks, paths, (manifest if use_manifest else None)
 
     def __query_select_duplicate(self, db_header, header, extra):
         """Ask the user how to resolve a duplicate header signature conflict.
@@ -1763,9 +3348,14 @@ class RawConfigScanner(RawConfigParser):
             extra: Context string, usually the source file path.
         Output:
             Selected header row or None when both entries should be discarded.
+            Without interactive the database row is kept.
         """
         v.msg(v.WARN, '<1> Database: ', ' '.join(map(lambda x: '{:02X}'.format(x), db_header)))
         v.msg(v.WARN, '<2> Current new file: ', ' '.join(map(lambda x: '{:02X}'.format(x), header)), '({})'.format(extra))
+        if not self.interactive:
+            v.msg(v.WARN, 'Header conflict, keep database')
+            return db_header
+
         try:
             raw = input('Select keep which? -- 1(Keep database - default) , 2(Use new) 3 (Discard both): ').strip()
 
@@ -1779,34 +3369,50 @@ class RawConfigScanner(RawConfigParser):
             print('Invalid input selct, use default 1')
             return db_header
 
-    def __check_duplicate_and_update(self, db_list, header, extra=None):
+    def __check_duplicate_and_update(self, db_rows, index, rows, header, extra=None):
         """Insert a new header row unless a conflicting duplicate must be resolved.
 
         Input:
-            db_list: Current database rows as a mutable list.
-            header: Candidate header row.
+            db_rows: Current database rows as a list of tuples, None marks a removed row.
+            index: Dictionary of (FAMILY_ID, VARIANT, VERSION, BUILD) -> position of
+                the first live row with that signature in db_rows.
+            rows: Set of all live rows, for O(1) exact-duplicate checks.
+            header: Candidate header row tuple.
             extra: Optional source-path context.
         Output:
-            Inserted/replaced header row, or None when nothing changes.
+            Inserted/replaced header row, or None when nothing is added.
         """
 
-        for i, db_header in enumerate(db_list):
-            if header[:self.BUILD + 1] == db_header[:self.BUILD + 1]:
-                if header == db_header:
-                    return
-                else:
-                    selected = self.__query_select_duplicate(db_header, header, extra)
-                    print(selected)
-                    if selected == header:
-                        db_list[i] = selected
-                        return selected
-                    elif selected is None:
-                        db_list.pop(i)
+        if header in rows:
+            return
+
+        key = header[:self.BUILD + 1]
+        i = index.get(key)
+        if i is not None:
+            db_header = db_rows[i]
+            selected = self.__query_select_duplicate(db_header, header, extra)
+            print(selected)
+            if selected == header:
+                db_rows[i] = selected
+                rows.discard(db_header)
+                rows.add(selected)
+                return selected
+            elif selected is None:
+                db_rows[i] = None
+                rows.discard(db_header)
+                # fall back to the next row with the same signature, if any
+                index.pop(key)
+                for j in range(i + 1, len(db_rows)):
+                    if db_rows[j] is not None and db_rows[j][:self.BUILD + 1] == key:
+                        index[key] = j
+                        break
 
-                    return
+            return
 
         v.msg(v.DEBUG2, tuple(map(lambda x: '{:02x}'.format(x), header)))
-        db_list.append(header)
+        index[key] = len(db_rows)
+        rows.add(header)
+        db_rows.append(header)
 
         return header
 
@@ -1821,35 +3427,51 @@ class RawConfigScanner(RawConfigParser):
         Key steps:
             1. Normalize file input into a scan directory.
             2. Parse headers from all discovered raw files.
-            3. Merge non-duplicate entries and mark the DB dirty when changed.
+            3. Merge them through a (FAMILY_ID, VARIANT, VERSION, BUILD) index,
+               exact duplicates are skipped by a set lookup.
+            4. Build the sorted, de-duplicated DataFrame once and mark the DB dirty when changed.
+            5. Write the manifest now when the DB is unchanged, else save() does it.
         """
 
-        db_list = self.db.values.tolist()
+        import pandas as pd
+
+        db_rows = [tuple(row) for row in self.db.values.tolist()]
+        rows = set(db_rows)
+        count = len(rows)
+        index = {}
+        for i, row in enumerate(db_rows):
+            index.setdefault(row[:self.BUILD + 1], i)
+
         new_list = []
         if os.path.exists(path):
             if os.path.isfile(path):
                 path = os.path.dirname(path)
             v.msg(v.ERR, 'search path: {:s}'.format(path))
-            header_blocks, paths = self.__search_header_in_dirs(path)
+            header_blocks, paths, manifest = self.__search_header_in_dirs(path)
+            if manifest is not None:
+                self.manifest = manifest
             for i, header in enumerate(header_blocks):
-                new_header = self.__check_duplicate_and_update(db_list, list(header.values), paths[i])
+                new_header = self.__check_duplicate_and_update(db_rows, index, rows, tuple(header), paths[i])
                 if new_header is not None:
                     v.msg(v.DEBUG2, new_header)
                     new_list.append(new_header)
         else:
             v.msg(v.ERR, 'Unexist path: {:s}'.format(path))
 
-        if new_list:
+        # rows discarded on a conflict change the DB without adding a header
+        if new_list or len(rows) != count:
             v.msg(v.INFO, 'add new {:d} headers: '.format(len(new_list)))
-            v.msg(v.DEBUG, pd.DataFrame(new_list, columns=self.db.columns).applymap(lambda x: '{:02X}'.format(x)))
+            if v.v_level >= v.DEBUG:
+                v.msg(v.DEBUG, '\n'.join(' '.join('{:02X}'.format(x) for x in row) for row in new_list))
 
-            self.db = pd.DataFrame(db_list, columns=self.db.columns)
-            self.db.sort_values(by=list(self.db.columns.values), inplace=True)
-            self.db.drop_duplicates(inplace=True)
+            self.db = pd.DataFrame(sorted(rows), columns=self.db.columns)
             self.db_new = True
 
-        return self.db
+        # with nothing to persist the manifest can go now, else save() writes it
+        if not self.db_new:
+            self.save_manifest()
 
+        return self.db
 
 if __name__ == "__main__":
     value = "A2 17 10 AA 20 34 22 25 D6 00 81 00 00 2C 58 01 00 00 00 05 59 01 08 00 00 06 62 01 05 00 01 44 68 01 48 00 01 26 B1 01 3F 00 00 47 F1 01 A7 00 00 07 99 02".split()
@@ -0,0 +1,307 @@
+import struct
+
+CRC24_POLY = 0x80001B
+CRC24_MASK = 0xFFFFFF
+CRC24_TOP_BIT = 0x800000
+
+# words folded per table step, (8 words = 16 bytes)
+SLICE_WORDS = 8
+SLICE_BYTES = SLICE_WORDS * 2
+
+
+def crc24_reduce(value):
+    """Reduce a carry-less value of any width into the 24-bit CRC space.
+
+    Input:
+        value: Non-negative integer, bits above 23 are folded by the polynomial.
+    Output:
+        24-bit CRC integer.
+    """
+    while value >> 24:
+        top = value.bit_length() - 1
+        value ^= (1 << top) ^ (CRC24_POLY << (top - 24))
+
+    return value
+
+
+def build_crc24_table():
+    """Build the 256-entry fold table for bits shifted out above bit 23.
+
+    Input:
+        None.
+    Output:
+        List where entry b is (b << 24) reduced by the CRC polynomial.
+    """
+    return [crc24_reduce(b << 24) for b in range(256)]
+
+
+CRC24_TABLE = build_crc24_table()
+
+
+def crc24_update_word(crc, word):
+    """Advance the CRC24 state by one 16-bit little-endian word.
+
+    Input:
+        crc: Current 24-bit CRC accumulator.
+        word: Next 16-bit data word.
+    Output:
+        Updated 24-bit CRC accumulator.
+    """
+    if crc & CRC24_TOP_BIT:
+        return ((crc << 1) & CRC24_MASK) ^ CRC24_POLY ^ word
+
+    return ((crc << 1) & CRC24_MASK) ^ word
+
+
+def crc24_update(crc, buf):
+    """Fold an even-length byte buffer into the CRC24 state, 8 words per table step.
+
+    Input:
+        crc: Current 24-bit CRC accumulator.
+        buf: Bytes-like object with an even number of bytes.
+    Output:
+        Updated 24-bit CRC accumulator.
+
+    Key steps:
+        1. A word shifted by at most 7 bits never reaches bit 24, so 8 words
+           are xor-ed in directly and the 8 CRC bits shifted out are folded
+           back with a single table lookup.
+        2. The remaining (< 8) words are folded one at a time.
+    """
+    table = CRC24_TABLE
+    full = len(buf) // SLICE_BYTES * SLICE_BYTES
+
+    for w0, w1, w2, w3, w4, w5, w6, w7 in struct.iter_unpack('<8H', buf[:full]):
+        val = ((crc << 8) ^ (w0 << 7) ^ (w1 << 6) ^ (w2 << 5) ^ (w3 << 4) ^
+               (w4 << 3) ^ (w5 << 2) ^ (w6 << 1) ^ w7)
+        crc = (val & CRC24_MASK) ^ table[val >> 24]
+
+    for (word,) in struct.iter_unpack('<H', buf[full:]):
+        crc = crc24_update_word(crc, word)
+
+    return crc
+
+
+def to_buffer(data, start_off=None, end_off=None):
+    """Return a byte buffer view of a data window, copying only when required.
+
+    Input:
+        data: Bytes-like object or sequence of integer byte values.
+        start_off: Optional start offset.
+        end_off: Optional exclusive end offset.
+    Output:
+        memoryview over bytes-like input, or bytes built from an int sequence.
+    """
+    try:
+        return memoryview(data)[start_off:end_off]
+    except TypeError:
+        return bytes(data[start_off:end_off])
+
+
+def crc24_calculate(data, start_off=None, end_off=None, phase=0):
+    """Calculate the config CRC24 for a window of byte data.
+
+    Input:
+        data: Bytes-like object or sequence of integer byte values.
+        start_off: Optional start offset.
+        end_off: Optional exclusive end offset.
+        phase: 1 when the window starts at the high byte of a word, the low
+            byte is then taken as zero (see crc24_combine).
+    Output:
+        24-bit CRC integer, an odd trailing byte is padded with zero.
+    """
+    buf = to_buffer(data, start_off, end_off)
+    if not len(buf):
+        return 0
+
+    crc = 0
+    if phase & 0x1:
+        crc = crc24_update_word(crc, buf[0] << 8)
+        buf = buf[1:]
+
+    size = len(buf)
+    crc = crc24_update(crc, buf[:size & ~0x1])
+    if size & 0x1:
+        crc = crc24_update_word(crc, buf[-1])
+
+    return crc
+
+
+def crc24_multiply(a, b):
+    """Multiply two CRC24 values as polynomials modulo the CRC polynomial.
+
+    Input:
+        a: 24-bit CRC value.
+        b: 24-bit CRC value.
+    Output:
+        24-bit product.
+    """
+    prod = 0
+    while b:
+        if b & 0x1:
+            prod ^= a
+        b >>= 1
+        a = crc24_update_word(a, 0)
+
+    return prod
+
+
+def build_crc24_x2n_table(size=64):
+    """Build the table of x^(2^n) modulo the CRC polynomial used by crc24_shift.
+
+    Input:
+        size: Number of entries, supports shifts below 2^size words.
+    Output:
+        List where entry n is x^(2^n) reduced by the CRC polynomial.
+    """
+    table = [0x2]
+    for _ in range(size - 1):
+        table.append(crc24_multiply(table[-1], table[-1]))
+
+    return table
+
+
+CRC24_X2N_TABLE = build_crc24_x2n_table()
+
+
+def crc24_shift(crc, words):
+    """Advance a CRC24 state over a run of zero words in O(log words).
+
+    Input:
+        crc: 24-bit CRC value.
+        words: Number of zero 16-bit words.
+    Output:
+        CRC24 value equal to feeding `words` zero words into `crc`.
+    """
+    n = 0
+    while words and crc:
+        if words & 0x1:
+            crc = crc24_multiply(crc, CRC24_X2N_TABLE[n])
+        words >>= 1
+        n += 1
+
+    return crc
+
+
+def crc24_combine(crc_a, crc_b, len_b, phase=0):
+    """Combine the CRC24 of two adjacent byte blocks A and B into CRC24(A + B).
+
+    Input:
+        crc_a: CRC24 of block A.
+        crc_b: CRC24 of block B, calculated with the same `phase`.
+        len_b: Byte length of block B.
+        phase: 1 when A has an odd length, so the first byte of B completes the
+            last word of A. crc_a keeps its zero pad byte and crc_b must be
+            calculated with crc24_calculate(..., phase=1).
+    Output:
+        24-bit CRC integer of the concatenated data.
+
+    Key steps:
+        1. The CRC has no init or final xor, so the CRC of A + B is the CRC of
+           A followed by zero words, xor the CRC of B.
+        2. A is shifted by the number of words B adds after A's last word.
+    """
+    return crc24_shift(crc_a, (len_b + 1 - (phase & 0x1)) // 2) ^ crc_b
+
+
+def crc24_calculate_chunks(data, start_off=None, end_off=None, chunk_size=0x100000, executor=None):
+    """Calculate the CRC24 of a large window as independent chunks and combine them.
+
+    Input:
+        data: Bytes-like object or sequence of integer byte values.
+        start_off: Optional start offset.
+        end_off: Optional exclusive end offset.
+        chunk_size: Chunk length in bytes, rounded down to a whole number of words.
+        executor: Optional concurrent.futures executor used to hash chunks in parallel.
+    Output:
+        24-bit CRC integer, identical to crc24_calculate on the same window.
+    """
+    buf = to_buffer(data, start_off, end_off)
+    chunk_size = max(chunk_size & ~0x1, 2)
+    chunks = [buf[i:i + chunk_size] for i in range(0, len(buf), chunk_size)]
+
+    if executor is None:
+        crcs = map(crc24_calculate, chunks)
+    else:
+        crcs = executor.map(crc24_calculate, map(bytes, chunks))
+
+    crc = 0
+    for chunk, crc_b in zip(chunks, crcs):
+        crc = crc24_combine(crc, crc_b, len(chunk))
+
+    return crc
+
+
+class Crc24(object):
+    """Incremental CRC24 with a hashlib-style update()/digest() interface."""
+
+    name = 'crc24'
+    digest_size = 3
+
+    def __init__(self, data=None):
+        """Create an empty CRC24 state and optionally fold in initial data.
+
+        Input:
+            data: Optional bytes-like object or sequence of integer byte values.
+        Output:
+            None.
+        """
+        self.__crc = 0
+        self.__pending = None   # low byte of a word split across chunks
+        if data is not None:
+            self.update(data)
+
+    def update(self, data):
+        """Fold the next chunk of bytes into the CRC state.
+
+        Input:
+            data: Bytes-like object or sequence of integer byte values.
+        Output:
+            None.
+
+        Key steps:
+            1. Complete the word left open by an odd-length previous chunk.
+            2. Fold all complete words of the chunk.
+            3. Keep an odd trailing byte pending as the low byte of the next word.
+        """
+        buf = to_buffer(data)
+        if not len(buf):
+            return
+
+        if self.__pending is not None:
+            self.__crc = crc24_update_word(self.__crc, self.__pending | (buf[0] << 8))
+            self.__pending = None
+            buf = buf[1:]
+
+        size = len(buf)
+        self.__crc = crc24_update(self.__crc, buf[:size & ~0x1])
+        if size & 0x1:
+            self.__pending = buf[-1]
+
+    def copy(self):
+        """Return an independent copy of the current CRC state."""
+        other = Crc24()
+        other.__crc = self.__crc
+        other.__pending = self.__pending
+        return other
+
+    def intdigest(self):
+        """Return the CRC24 of all data so far, padding an odd tail byte with zero.
+
+        Input:
+            None.
+        Output:
+            24-bit CRC integer. The running state is not modified.
+        """
+        if self.__pending is not None:
+            return crc24_update_word(self.__crc, self.__pending)
+
+        return self.__crc
+
+    def digest(self):
+        """Return the CRC24 as 3 big-endian bytes."""
+        return self.intdigest().to_bytes(self.digest_size, 'big')
+
+    def hexdigest(self):
+        """Return the CRC24 as 6 hexadecimal digits."""
+        return '{:06X}'.format(self.intdigest())
@@ -1,7 +1,29 @@
+def build_crc8_table(poly):
+    """Build the 256-entry lookup table for a reflected CRC8 polynomial.
+
+    Input:
+        poly: Reflected CRC8 polynomial.
+    Output:
+        List where entry i is the CRC8 of the single byte i.
+    """
+    table = []
+    for val in range(256):
+        crc = val
+        for i in range(8):
+            if crc & 0x01:
+                crc = (crc >> 1) ^ poly
+            else:
+                crc >>= 1
+        table.append(crc)
+
+    return table
+
+
 class MessageCrc(object):
     """Compute an 8-bit CRC for message byte arrays."""
 
     CRC_PLOY = 0x8c
+    CRC_TABLE = build_crc8_table(CRC_PLOY)
 
     def __init__(self, data):
         """Store the source byte array used for CRC8 calculation.
@@ -21,36 +43,78 @@ class MessageCrc(object):
             val: Next byte value to fold into the CRC.
         Output:
             Updated CRC accumulator.
-
-        Key steps:
-            1. Process 8 bits from the input byte.
-            2. Shift the CRC register and apply the configured polynomial when needed.
         """
-        for i in range(8):
-            fb = (crc ^ val) & 0x01
-            val >>= 1
-            crc >>= 1
-            if fb:
-                crc ^= MessageCrc.CRC_PLOY
-
-        return crc
+        return MessageCrc.CRC_TABLE[crc ^ val]
 
-    def calculate(self):
-        """Calculate and print the running CRC8 value for the stored byte array.
+    def calculate(self, trace=False):
+        """Calculate the CRC8 value for the stored byte array.
 
         Input:
-            None.
+            trace: Print the running CRC after every byte when True.
         Output:
             Final CRC8 integer.
         """
-        data = self.__data
+        table = MessageCrc.CRC_TABLE
         crc = 0
-        for i in range(len(data)):
-            crc = self.crc8(crc, data[i])
-            print(hex(crc))
+        for val in self.__data:
+            crc = table[crc ^ val]
+            if trace:
+                print(hex(crc))
 
         return crc
 
+    @classmethod
+    def calculate_many(cls, messages):
+        """Calculate the CRC8 of many messages at once.
+
+        Input:
+            messages: Iterable of byte sequences, or a 2D NumPy uint8 array
+                holding one fixed-size message per row.
+        Output:
+            List of CRC8 integers, or a NumPy uint8 array for array input.
+
+        Key steps:
+            1. For array input, fold one column per step across all rows with a
+               vectorized table lookup.
+            2. Otherwise fold each message byte by byte through the table.
+        """
+        table = cls.CRC_TABLE
+
+        if hasattr(messages, 'ndim'):
+            import numpy as np
+
+            lut = np.array(table, dtype=np.uint8)
+            crc = np.zeros(messages.shape[0], dtype=np.uint8)
+            for col in range(messages.shape[1]):
+                crc = lut[crc ^ messages[:, col]]
+            return crc
+
+        result = []
+        for msg in messages:
+            crc = 0
+            for val in msg:
+                crc = table[crc ^ val]
+            result.append(crc)
+
+        return result
+
+    @classmethod
+    def check_many(cls, messages):
+        """Validate many messages whose last byte is the CRC8 of the others.
+
+        Input:
+            messages: Iterable of byte sequences, or a 2D NumPy uint8 array
+                holding one fixed-size message per row.
+        Output:
+            List of bools, or a NumPy bool array for array input.
+        """
+        if hasattr(messages, 'ndim'):
+            return cls.calculate_many(messages[:, :-1]) == messages[:, -1]
+
+        messages = list(messages)
+        crcs = cls.calculate_many(msg[:-1] for msg in messages)
+        return [len(msg) > 0 and crc == msg[-1] for msg, crc in zip(messages, crcs)]
+
 import array
 if __name__ == "__main__":
 
@@ -68,4 +132,4 @@ if __name__ == "__main__":
     #data = [0x02, 0x42,0x05, 0x00,0,0,0,0,0,0]
     data = [0x32, 0x91, 0xa1, 0x80, 0x7f,0x1, 0x67,0,0,0]
     a = MessageCrc(data)
-    print("Final CRC: {}".format(hex(a.calculate())))
\ No newline at end of file
+    print("Final CRC: {}".format(hex(a.calculate(trace=True))))
\ No newline at end of file
@@ -0,0 +1,277 @@
+import os
+import mmap
+import time
+import argparse
+import numpy as np
+
+from crc8 import MessageCrc
+from verbose import VerboseMessage as v
+
+class MessageLogValidator(object):
+    """Validate the trailing CRC8 byte of every message in a maxTouch T5 capture."""
+
+    (FORMAT_BINARY, FORMAT_HEX) = range(2)
+
+    HEX_EXTENSIONS = ('txt', 'log', 'hex', 'csv')
+
+    def __init__(self, msg_size=None, block_messages=0x10000, max_offsets=16):
+        """Configure message framing and report limits.
+
+        Input:
+            msg_size: Message size in bytes including the CRC byte, required for binary captures.
+            block_messages: Number of binary messages checked per vectorized block.
+            max_offsets: Maximum number of corrupt offsets kept per report ID.
+        Output:
+            None. Initializes empty report and statistics.
+        """
+        self.msg_size = msg_size
+        self.block_messages = block_messages
+        self.max_offsets = max_offsets
+        self.clear()
+
+    def clear(self):
+        """Reset per-report-ID counters and throughput statistics."""
+        self.report = {}
+        self.stats = {'bytes': 0, 'messages': 0, 'corrupt': 0, 'truncated': 0, 'skipped': 0, 'seconds': 0.0}
+
+    def file_format(self, path):
+        """Guess the capture format from the file extension.
+
+        Input:
+            path: Capture file path.
+        Output:
+            FORMAT_HEX for text extensions, otherwise FORMAT_BINARY.
+        """
+        ext = path.rsplit('.', 1)[-1].lower()
+        if ext in self.HEX_EXTENSIONS:
+            return self.FORMAT_HEX
+
+        return self.FORMAT_BINARY
+
+    def record(self, report_ids, valid, offsets):
+        """Accumulate per-report-ID totals and corrupt offsets for one block.
+
+        Input:
+            report_ids: NumPy array of the first byte of each message.
+            valid: NumPy bool array, True when the message CRC matches.
+            offsets: NumPy array of message offsets (byte offset or line number).
+        Output:
+            None. Updates self.report and self.stats.
+        """
+        totals = np.bincount(report_ids, minlength=256)
+        bad = ~valid
+        corrupt = np.bincount(report_ids[bad], minlength=256)
+        bad_ids = report_ids[bad]
+        bad_offsets = offsets[bad]
+
+        for rid in np.nonzero(totals)[0]:
+            rid = int(rid)
+            item = self.report.setdefault(rid, {'total': 0, 'corrupt': 0, 'offsets': []})
+            item['total'] += int(totals[rid])
+            if corrupt[rid]:
+                item['corrupt'] += int(corrupt[rid])
+                left = self.max_offsets - len(item['offsets'])
+                if left > 0:
+                    item['offsets'].extend(int(x) for x in bad_offsets[bad_ids == rid][:left])
+
+        self.stats['messages'] += len(report_ids)
+        self.stats['corrupt'] += int(bad.sum())
+
+    def validate_binary(self, mm):
+        """Check fixed-size binary messages straight from the mapped file.
+
+        Input:
+            mm: mmap object (or other buffer) holding the capture.
+        Output:
+            None. Updates report and statistics block by block.
+        """
+        size = self.msg_size
+        if not size or size < 2:
+            raise ValueError('Binary capture needs a message size of at least 2 bytes')
+
+        count = len(mm) // size
+        block = max(self.block_messages, 1)
+        for st in range(0, count, block):
+            n = min(block, count - st)
+            msgs = np.frombuffer(mm, dtype=np.uint8, count=n * size, offset=st * size).reshape(n, size)
+            offsets = (np.arange(n, dtype=np.int64) + st) * size
+            self.record(msgs[:, 0], MessageCrc.check_many(msgs), offsets)
+            del msgs
+
+        left = len(mm) - count * size
+        if left:
+            self.stats['truncated'] += 1
+            v.msg(v.WARN, 'Truncated message at offset {:d}, {:d} bytes left'.format(count * size, left))
+
+    def validate_hex(self, mm):
+        """Check hexadecimal text messages, one message per line.
+
+        Input:
+            mm: mmap object holding the capture text.
+        Output:
+            None. Updates report and statistics, offsets are 1-based line numbers.
+        """
+        block = max(self.block_messages, 1)
+        msgs = []
+        lines = []
+        for lineno, line in enumerate(iter(mm.readline, b''), 1):
+            try:
+                msg = [int(x, 16) for x in line.replace(b',', b' ').split()]
+            except ValueError:
+                self.stats['skipped'] += 1
+                v.msg(v.WARN, 'Skip non-hex line {:d}: {}'.format(lineno, line.strip()))
+                continue
+
+            if any(x > 0xFF for x in msg):
+                # e.g. a timestamp column, not a message byte
+                self.stats['skipped'] += 1
+                v.msg(v.WARN, 'Skip line {:d} with values above 0xFF: {}'.format(lineno, line.strip()))
+                continue
+
+            if not msg:
+                continue
+
+            if len(msg) < 2:
+                self.stats['truncated'] += 1
+                v.msg(v.WARN, 'Truncated message at line {:d}'.format(lineno))
+                continue
+
+            msgs.append(msg)
+            lines.append(lineno)
+            if len(msgs) >= block:
+                self.validate_hex_block(msgs, lines)
+                msgs = []
+                lines = []
+
+        if msgs:
+            self.validate_hex_block(msgs, lines)
+
+    def validate_hex_block(self, msgs, lines):
+        """Check one block of parsed hex messages.
+
+        Input:
+            msgs: List of message byte lists.
+            lines: Line numbers aligned with msgs.
+        Output:
+            None. Updates report and statistics.
+        """
+        report_ids = np.array([msg[0] & 0xff for msg in msgs], dtype=np.uint8)
+        valid = np.array(MessageCrc.check_many(msgs), dtype=bool)
+        self.record(report_ids, valid, np.array(lines, dtype=np.int64))
+
+    def validate(self, path, fmt=None):
+        """Validate a capture file through a read-only memory map.
+
+        Input:
+            path: Capture file path.
+            fmt: Optional FORMAT_* value, guessed from the extension when omitted.
+        Output:
+            Report dictionary keyed by report ID with total/corrupt/offsets entries.
+
+        Key steps:
+            1. Map the file read-only so only the pages in use are resident.
+            2. Check binary captures in vectorized blocks or hex captures line by line.
+            3. Record elapsed time for the throughput statistics.
+        """
+        if fmt is None:
+            fmt = self.file_format(path)
+
+        t0 = time.perf_counter()
+        size = os.path.getsize(path)
+        if size:
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if fmt == self.FORMAT_HEX:
+                        self.validate_hex(mm)
+                    else:
+                        self.validate_binary(mm)
+
+        self.stats['bytes'] += size
+        self.stats['seconds'] += time.perf_counter() - t0
+
+        return self.report
+
+    def summary(self):
+        """Print per-report-ID results and throughput statistics."""
+        for rid in sorted(self.report):
+            item = self.report[rid]
+            v.msg(v.CONST, 'Report ID {:3d} (0x{:02X}): total={:d} corrupt={:d} {:s}'.format(
+                rid, rid, item['total'], item['corrupt'],
+                ('offsets: ' + ' '.join(map(str, item['offsets']))) if item['offsets'] else ''))
+
+        stats = self.stats
+        seconds = stats['seconds'] or 1e-9
+        v.msg(v.CONST, 'Messages: {:d}, corrupt: {:d}, truncated: {:d}, skipped lines: {:d}'.format(
+            stats['messages'], stats['corrupt'], stats['truncated'], stats['skipped']))
+        v.msg(v.CONST, 'Throughput: {:.1f} MB/s, {:.0f} msg/s ({:.3f}s)'.format(
+            stats['bytes'] / seconds / 1e6, stats['messages'] / seconds, stats['seconds']))
+
+def msglog(args=None):
+    """Run the CLI workflow for validating T5 message captures.
+
+    Input:
+        args: Optional command-line argument list. When omitted, sys.argv[1:] is used.
+    Output:
+        Number of corrupt messages found.
+    """
+    parser = parse_args()
+    args = parser.parse_args(args)
+
+    v.set(args.verbose)
+
+    fmt = None
+    if args.hex:
+        fmt = MessageLogValidator.FORMAT_HEX
+
+    validator = MessageLogValidator(args.size, args.block, args.max_offsets)
+    if fmt is None and args.size is None:
+        if any(validator.file_format(path) == validator.FORMAT_BINARY for path in args.filename):
+            parser.error('-n/--size is required for binary captures')
+
+    for path in args.filename:
+        if os.path.exists(path):
+            validator.validate(path, fmt)
+        else:
+            v.msg(v.WARN, 'Un-exist file name \'{:s}\''.format(path))
+
+    validator.summary()
+
+    return validator.stats['corrupt']
+
+def parse_args():
+    """Build and return the command-line argument parser for msglog."""
+
+    parser = argparse.ArgumentParser(
+        prog='Maxtouch T5 message log validator',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description='Validate the CRC8 byte of every T5 message in a binary or hex capture')
+
+    parser.add_argument('filename', nargs='+',
+                        metavar='CAPTURE',
+                        help='binary capture, or hex text capture with one message per line')
+
+    parser.add_argument('-n', '--size', type=int,
+                        default=None,
+                        help='binary message size in bytes, including the CRC byte')
+
+    parser.add_argument('-x', '--hex', action='store_true',
+                        help='treat the capture as hex text regardless of its extension')
+
+    parser.add_argument('-b', '--block', type=int,
+                        default=0x10000,
+                        help='messages checked per block')
+
+    parser.add_argument('-m', '--max-offsets', type=int,
+                        default=16,
+                        help='corrupt offsets reported per report ID')
+
+    parser.add_argument('-v', '--verbose',
+                        type=int,
+                        choices=range(5),
+                        default=1,
+                        help='set debug verbose level[0-5]')
+
+    return parser
+
+if __name__ == "__main__":
+    msglog()
@@ -0,0 +1,247 @@
+import os
+import csv
+import time
+import shutil
+import hashlib
+import tempfile
+
+from config_parser import file_digest
+from verbose import VerboseMessage as v
+
+class OutputStore(object):
+    """Content-addressed store for rebuilt xcfg/raw/image outputs.
+
+    xcfg and raw outputs are hashed in memory and written to
+    objects/<sha256[:2]>/<sha256>.<ext> only when that object does not exist
+    yet. Images are written into a per-task staging directory under their
+    usual timestamped name first, then moved in the same way or dropped, so
+    a rerun producing the same bytes adds nothing. index.csv maps every source file and output
+    kind to its latest object and the name it was generated with.
+    """
+
+    INDEX_FILE = 'index.csv'
+    INDEX_COLUMNS = ('source', 'kind', 'object', 'name', 'updated')
+
+    def __init__(self, root):
+        """Open (or create) a store directory.
+
+        Input:
+            root: Store directory.
+        Output:
+            None. The index is loaded lazily by load_index().
+        """
+        self.root = os.path.abspath(root)
+        self.staging = os.path.join(self.root, 'staging')
+        self.objects = os.path.join(self.root, 'objects')
+        self.index = None
+        self.index_new = False
+        os.makedirs(self.staging, exist_ok=True)
+        os.makedirs(self.objects, exist_ok=True)
+
+    def stage_dir(self):
+        """Create a staging directory of its own for one source file.
+
+        Sources with the same file name, handled by parallel workers in the
+        same second, would otherwise write the same timestamped name.
+        Remove it with discard() when done.
+        """
+        return tempfile.mkdtemp(dir=self.staging)
+
+    def staging_path(self, source, folder):
+        """Return the base path handed to the savers, so they write into the store.
+
+        Input:
+            source: Source xcfg path.
+            folder: Directory from stage_dir().
+        Output:
+            Path in folder with the source file name.
+        """
+        return os.path.join(folder, os.path.basename(source))
+
+    def staged(self, path):
+        """Whether path was written below the staging directory."""
+        return os.path.abspath(path).startswith(os.path.join(self.staging, ''))
+
+    def discard(self, folder):
+        """Remove a directory from stage_dir() with anything left in it."""
+        shutil.rmtree(folder, ignore_errors=True)
+
+    def object_path(self, digest, ext):
+        """Return the store object path of a content digest."""
+        return os.path.join(self.objects, digest[:2], '{:s}.{:s}'.format(digest, ext))
+
+    def add_data(self, name, data):
+        """Store output bytes unless an object with the same content exists.
+
+        Safe to call from several processes at once.
+
+        Input:
+            name: Name the output was generated with, gives the extension.
+            data: Output file content.
+        Output:
+            Path of the store object holding the content.
+        """
+        ext = name.rsplit('.', 1)[-1].lower() if '.' in os.path.basename(name) else 'bin'
+        target = self.object_path(hashlib.sha256(data).hexdigest(), ext)
+
+        if os.path.exists(target):
+            v.msg(v.CONST, 'Output exists in store: {:s}'.format(target))
+            return target
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        v.msg(v.CONST, 'Output added to store: {:s}'.format(target))
+
+        return target
+
+    def add(self, path):
+        """Move a written output into the store, dropping it when the content exists.
+
+        Safe to call from several processes at once.
+
+        Input:
+            path: Output file written by a saver.
+        Output:
+            Path of the store object holding the content.
+        """
+        ext = path.rsplit('.', 1)[-1].lower() if '.' in os.path.basename(path) else 'bin'
+        target = self.object_path(file_digest(path), ext)
+
+        if os.path.exists(target):
+            os.remove(path)
+            v.msg(v.CONST, 'Output exists in store: {:s}'.format(target))
+            return target
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.replace(path, target)
+        except OSError:
+            # staging and objects on different file systems
+            shutil.move(path, target)
+        v.msg(v.CONST, 'Output added to store: {:s}'.format(target))
+
+        return target
+
+    def add_xcfg(self, xcfg, output, base):
+        """Store the rebuilt xcfg of a parser without writing a staging file.
+
+        Input:
+            xcfg: Loaded XcfgConfigParser, not in stream mode.
+            output: CLI output selector or None.
+            base: Base path from staging_path(), names the output.
+        Output:
+            Tuple of (generated name, store object path), or None when the
+            xcfg needs no change.
+        """
+        rebuilt = xcfg.rebuild_content(output)
+        if rebuilt is None:
+            return None
+
+        name = xcfg.output_filename(rebuilt[1], base)
+        return name, self.add_data(name, b''.join(map(xcfg.encode, rebuilt[0])))
+
+    def add_raw(self, builder, output, base):
+        """Store the raw content of an XcfgBuildRawFile without writing a staging file.
+
+        Input:
+            builder: XcfgBuildRawFile after rebuild_raw_data().
+            output: CLI output selector or None.
+            base: Base path from staging_path(), names the output.
+        Output:
+            Tuple of (generated name, store object path), or None without raw content.
+        """
+        data = builder.dumps()
+        if data is None:
+            return None
+
+        name = builder.output_filename(output, base, 'raw')
+        return name, self.add_data(name, data)
+
+    def load_index(self):
+        """Load index.csv into {(source, kind): (object, name, updated)}."""
+        if self.index is not None:
+            return self.index
+
+        self.index = {}
+        path = os.path.join(self.root, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return self.index
+
+        try:
+            with open(path, newline='') as f:
+                for row in csv.DictReader(f):
+                    self.index[(row['source'], row['kind'])] = (row['object'], row['name'], float(row['updated']))
+        except Exception as e:
+            v.msg(v.ERR, 'Unable to load store index: {:s}, Error = {:s}'.format(path, str(e)))
+            self.index = {}
+
+        return self.index
+
+    def record(self, source, name, target):
+        """Remember target as the latest output of its kind for a source file.
+
+        Input:
+            source: Source xcfg path.
+            name: Name the output was generated with.
+            target: Store object path returned by add().
+        Output:
+            None. Written by save_index().
+        """
+        index = self.load_index()
+        key = (os.path.abspath(source), target.rsplit('.', 1)[-1])
+        value = (os.path.relpath(target, self.root), os.path.basename(name))
+        old = index.get(key)
+        if old is None or old[:2] != value:
+            index[key] = value + (time.time(),)
+            self.index_new = True
+
+    def put(self, source, path):
+        """add() an output of source and record() it, see both.
+
+        Input:
+            source: Source xcfg path.
+            path: Output file written by a saver, or None.
+        Output:
+            Store object path. None, or a path outside the staging directory
+            (an xcfg patched in place), is returned unchanged.
+        """
+        if not path or not self.staged(path):
+            return path
+
+        target = self.add(path)
+        self.record(source, path, target)
+
+        return target
+
+    def latest(self, source, kind):
+        """Return the store object path of the latest output of a kind, or None."""
+        item = self.load_index().get((os.path.abspath(source), kind))
+        if item is None:
+            return None
+
+        return os.path.join(self.root, item[0])
+
+    def save_index(self):
+        """Write index.csv when it changed, replacing the old file atomically."""
+        if not self.index_new:
+            return
+
+        path = os.path.join(self.root, self.INDEX_FILE)
+        try:
+            with open(path + '.tmp', 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.INDEX_COLUMNS)
+                for key in sorted(self.index):
+                    writer.writerow(key + self.index[key])
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            v.msg(v.ERR, 'Unable to save store index: {:s}, Error = {:s}'.format(path, str(e)))
+
+        self.index_new = False
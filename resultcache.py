@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import sqlite3
+
+from config_parser import file_digest
+from verbose import VerboseMessage as v
+
+class ResultCache(object):
+    """SQLite cache of xcfg CRC results keyed by file content, tool version and options.
+
+    A hit means the file bytes, the tool version and the output options are the
+    same as in an earlier run of the same path whose outputs are all still on
+    disk, so the file does not need to be parsed again. Rows are per path since
+    the outputs are written next to the source file.
+    """
+
+    DEFAULT_FILE = '.xcfg_cache.sqlite'
+
+    SCHEMA = ('CREATE TABLE IF NOT EXISTS results ('
+              'key TEXT, path TEXT, file_crc INTEGER, calculated_crc INTEGER, '
+              'file_version INTEGER, outputs TEXT, created REAL, accessed REAL, PRIMARY KEY (key, path))')
+
+    def __init__(self, path=None, version='', max_entries=20000, max_age=30 * 86400):
+        """Open (or create) the cache database.
+
+        Input:
+            path: SQLite file, DEFAULT_FILE in the working directory when omitted.
+            version: Tool version string, part of every key.
+            max_entries: Entries kept after evict(), least recently used go first.
+            max_age: Seconds an unused entry is kept.
+        Output:
+            None. The cache is disabled with a warning when the file cannot be opened.
+        """
+        self.path = path or os.path.join(os.getcwd(), self.DEFAULT_FILE)
+        self.version = version
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.digests = {}
+        self.db = None
+        try:
+            self.db = sqlite3.connect(self.path)
+            self.db.execute(self.SCHEMA)
+            self.db.commit()
+        except sqlite3.Error as e:
+            v.msg(v.WARN, 'Result cache disabled: {:s}, Error = {:s}'.format(self.path, str(e)))
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Commit pending updates, evict stale entries and close the database."""
+        if self.db is not None:
+            try:
+                self.evict()
+            except sqlite3.Error as e:
+                v.msg(v.WARN, 'Result cache eviction failed: {:s}'.format(str(e)))
+            self.db.close()
+            self.db = None
+
+    file_hash = staticmethod(file_digest)
+
+    def key(self, digest, *options):
+        """Build a cache key from a content digest and the options that shape the outputs.
+
+        Input:
+            digest: file_hash() of the xcfg.
+            options: Values such as the output selector or the DB digest.
+        Output:
+            Key string.
+        """
+        return '|'.join([digest, self.version] + [str(x) for x in options])
+
+    def file_key(self, path, output=None, raw=False, database=None, image=None, in_place=False, store=None):
+        """Build the cache key of one xcfg run.
+
+        Input:
+            path: xcfg file path.
+            output: CLI output selector or None.
+            raw: Whether a raw file is generated.
+            database: Header DB path, its content is part of the key for raw runs.
+            image: Image formats ('bin', 'hex') written as well, or None.
+            in_place: Whether the checksum is patched into the source file.
+            store: Output store directory, or None for outputs next to the source.
+        Output:
+            Key string.
+        """
+        db_digest = ''
+        if (raw or image) and database and os.path.exists(database):
+            db_digest = self.digests.get(database)
+            if db_digest is None:
+                db_digest = self.digests[database] = self.file_hash(database)
+
+        options = [output, int(bool(raw)), db_digest]
+        if image:
+            options.append(','.join(sorted(set(image))))
+        if in_place:
+            options.append('in-place')
+        if store:
+            options.append('store:' + os.path.abspath(store))
+
+        return self.key(self.file_hash(path), *options)
+
+    def get(self, key, path):
+        """Return the cached result for a key, or None on a miss.
+
+        Input:
+            key: Cache key from key().
+            path: xcfg file path.
+        Output:
+            Dictionary with path, file_crc, calculated_crc, file_version and outputs.
+            Entries whose outputs were removed count as a miss.
+        """
+        if self.db is None:
+            return None
+
+        path = os.path.abspath(path)
+        row = self.db.execute('SELECT path, file_crc, calculated_crc, file_version, outputs FROM results WHERE key=? AND path=?',
+                              (key, path)).fetchone()
+        if row is None:
+            return None
+
+        result = {'path': row[0], 'file_crc': row[1], 'calculated_crc': row[2], 'file_version': row[3],
+                  'outputs': json.loads(row[4])}
+        if not all(os.path.exists(name) for name in result['outputs']):
+            return None
+
+        self.db.execute('UPDATE results SET accessed=? WHERE key=? AND path=?', (time.time(), key, path))
+
+        return result
+
+    def put(self, key, path, result):
+        """Store a result dictionary as produced by get(), committed by close()."""
+        if self.db is None:
+            return
+
+        path = os.path.abspath(path)
+        now = time.time()
+        self.db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (key, path, result.get('file_crc'), result.get('calculated_crc'),
+                         result.get('file_version'), json.dumps(result.get('outputs', [])), now, now))
+
+    def evict(self):
+        """Drop entries older than max_age, then the least recently used beyond max_entries."""
+        if self.db is None:
+            return
+
+        self.db.execute('DELETE FROM results WHERE accessed < ?', (time.time() - self.max_age,))
+        self.db.execute('DELETE FROM results WHERE rowid NOT IN '
+                        '(SELECT rowid FROM results ORDER BY accessed DESC LIMIT ?)', (self.max_entries,))
+        self.db.commit()
@@ -3,6 +3,9 @@ import sys
 import argparse
 import config_parser as mcp
 import utils
+from resultcache import ResultCache
+from outputstore import OutputStore
+from watch import ConfigWatcher
 from verbose import VerboseMessage as v
 
 def runstat(args=None):
@@ -17,7 +20,8 @@ def runstat(args=None):
     Key steps:
         1. Parse CLI arguments and configure verbose logging.
         2. Optionally load or scan the info-block database.
-        3. Dispatch to XCFG processing or TXT CRC calculation.
+        3. Dispatch to XCFG processing, RAW CRC verification or TXT CRC
+           calculation, or stay resident in --watch mode.
         4. Apply the resolved output-version policy to xcfg/raw generation.
     """
     parser = parse_args(args)
@@ -25,22 +29,45 @@ def runstat(args=None):
     args = parser.parse_args(aargs)
     print(args)
 
-    if not args.filename and not args.scan:
+    if not args.filename and not args.scan and not args.watch and not args.export_db:
         parser.print_help()
         return
 
     v.set(args.verbose)
 
-    db_loader = mcp.RawConfigScanner()
-    db = None
+    if args.crc_check:
+        mcp.XcfgCalculateCRC.engine = mcp.XcfgCalculateCRC.CRC_ENGINE_CHECK
 
-    path = args.database
-    if path:
-        if os.path.exists(path):
-            db = db_loader.load(path)
-            #v.msg(v.INFO, db.applymap(lambda x: '{:02X}'.format(x)))
+    if args.watch:
+        if not os.path.isdir(args.watch):
+            v.msg(v.WARN, 'Un-exist watching dir \'{:s}\''.format(args.watch))
+            return
+
+        watcher = ConfigWatcher(args.watch, args.output, args.raw, args.stream, args.database,
+                                args.interval, args.watch_cache << 20)
+        watcher.run()
+        return
+
+    if args.export_db:
+        if os.path.exists(args.database):
+            count = mcp.HeaderFile.convert(args.database, args.export_db)
+            v.msg(v.CONST, 'Export db file: {:s} -> {:s} ({:d} rows)'.format(args.database, args.export_db, count))
         else:
-            v.msg(v.INFO, 'No use database')
+            v.msg(v.WARN, 'Un-exist db file \'{:s}\''.format(args.database))
+
+    db = None
+
+    # the database (and pandas behind it) is only needed for raw/image export and scanning
+    if args.raw or args.image or args.scan:
+        db_loader = mcp.RawConfigScanner()
+
+        path = args.database
+        if path:
+            if os.path.exists(path):
+                db = db_loader.load(path) if args.scan else mcp.load_header_db(path)
+                #v.msg(v.INFO, db.applymap(lambda x: '{:02X}'.format(x)))
+            else:
+                v.msg(v.INFO, 'No use database')
 
     path = args.scan
     if path:
@@ -56,17 +83,77 @@ def runstat(args=None):
         if os.path.exists(path):
             ex_type = path.rsplit('.', 1)[-1].lower()
             if ex_type == 'xcfg':
-                # load xcfg
-                xcfg = mcp.XcfgConfigParser()
-                xcfg.load(path)
-                xcfg.save(args.output)
-
-                # save to raw
-                builder = mcp.XcfgBuildRawFile(xcfg)
-                if args.raw:
-                    builder.load_db(db)
-                    builder.rebuild_raw_data(args.output)
-                    builder.save_raw_file(args.output)
+                # unchanged file with its outputs still present: skip parsing
+                cache = None
+                result = None
+                if not args.no_cache and not args.crc_check:
+                    cache = ResultCache(args.cache, mcp.__version__)
+                    key = cache.file_key(path, args.output, args.raw, args.database, args.image, args.in_place, args.store)
+                    result = cache.get(key, path)
+
+                if result is not None:
+                    v.msg(v.CONST, 'CRC: calculate={:6X}, cfg={:6X} {:s} (cached)'.
+                          format(result['calculated_crc'], result['file_crc'],
+                                 '(matched)' if result['calculated_crc'] == result['file_crc'] else '(mismatch) X X X'))
+                    for name in result['outputs']:
+                        v.msg(v.CONST, 'Output file: {:s}'.format(name))
+                else:
+                    # (name, store object or None when the file was written by a saver)
+                    written = []
+                    # outputs are hashed or staged per file, then moved in by content
+                    store = OutputStore(args.store) if args.store else None
+                    folder = store.stage_dir() if store is not None else None
+                    base = store.staging_path(path, folder) if folder is not None else None
+
+                    try:
+                        # load xcfg
+                        xcfg = mcp.XcfgConfigParser()
+                        xcfg.load(path, stream=args.stream)
+                        if store is not None and not (args.stream or args.in_place):
+                            written.append(store.add_xcfg(xcfg, args.output, base))
+                        else:
+                            written.append((xcfg.save(args.output, base, in_place=args.in_place), None))
+
+                        # save to raw
+                        builder = mcp.XcfgBuildRawFile(xcfg)
+                        images = args.image or []
+                        if args.raw or 'bin' in images:
+                            builder.load_db(db)
+                            builder.rebuild_raw_data(args.output)
+                        if args.raw:
+                            if store is not None:
+                                written.append(store.add_raw(builder, args.output, base))
+                            else:
+                                written.append((builder.save_raw_file(args.output, base), None))
+                        for image in images:
+                            written.append((builder.save_image_file(image, args.output, base), None))
+
+                        outputs = []
+                        for name, target in (x for x in written if x and x[0]):
+                            if store is not None:
+                                if target is None:
+                                    target = store.put(path, name)
+                                else:
+                                    store.record(path, name, target)
+                            outputs.append(target or name)
+                    finally:
+                        if store is not None:
+                            store.discard(folder)
+                            store.save_index()
+
+                    if cache is not None and xcfg.calculated_crc() is not None and xcfg.config_crc() is not None:
+                        cache.put(key, path, {'path': path, 'file_crc': xcfg.config_crc(), 'calculated_crc': xcfg.calculated_crc(),
+                                        'file_version': xcfg.get_ext('file_version'), 'outputs': [x for x in outputs if x]})
+
+                if cache is not None:
+                    cache.close()
+            elif ex_type == 'raw':
+                try:
+                    result = mcp.RawConfigParser().verify(path)
+                    if result is None:
+                        v.msg(v.ERR, 'Un-readable raw file \'{:s}\''.format(path))
+                except ValueError as e:
+                    v.msg(v.ERR, 'Un-readable raw file \'{:s}\', Error = {:s}'.format(path, str(e)))
             elif ex_type == 'txt':
                 sep = args.sep
                 cal = utils.Calculate_CRC(sep)
@@ -96,19 +183,37 @@ def parse_args(args=None):
         description='Tools for parsing maxTouch config and calculating config crc')
 
     parser.add_argument('--version',
-                        action='version', version='%(prog)s v1.2.10',
+                        action='version', version='%(prog)s v' + mcp.__version__,
                         help='show version')
 
     parser.add_argument('-f', '--filename', required=False,
                         nargs='?',
                         default='',
-                        metavar='XCFG|TXT',
-                        help='where the \'XCFG|TXT\' file will be load')
+                        metavar='XCFG|TXT|RAW',
+                        help='where the \'XCFG|TXT\' file will be load, a \'RAW\' file is CRC-verified')
+
+    parser.add_argument('--stream', required=False,
+                        action='store_true',
+                        help='parse the xcfg lazily without keeping its text in memory')
+
+    parser.add_argument('--store', required=False,
+                        default='',
+                        metavar='DIR',
+                        help='save outputs into a content-addressed store, identical outputs are kept once')
+
+    parser.add_argument('--in-place', required=False,
+                        action='store_true',
+                        help='patch a mismatched checksum into the xcfg itself instead of saving a rebuilt copy')
 
     parser.add_argument('-r', '--raw', required=False,
                         action='store_true',
                         help='whether save out a \'RAW\' file')
 
+    parser.add_argument('--image', required=False,
+                        action='append',
+                        choices=mcp.XcfgBuildRawFile.IMAGE_FORMATS,
+                        help='also save the raw content as a packed binary (bin) or an Intel-HEX image laid out by OBJECT_ADDRESS (hex), may be repeated')
+
     parser.add_argument('-sep', '--sep', required=False,
                         nargs='?',
                         default=None,
@@ -125,7 +230,12 @@ def parse_args(args=None):
     parser.add_argument('-db', '--database', required=False,
                         nargs='?',
                         default='db_header.csv',
-                        help='load chip Info Block database')
+                        help='load chip Info Block database, CSV or binary (.xdb)')
+
+    parser.add_argument('--export-db', required=False,
+                        default='',
+                        metavar='FILE',
+                        help='convert the -db database to FILE, binary when it ends with .xdb, CSV otherwise')
     """
     parser.add_argument('-e', '--extra', required=False,
                         #metavar=('<X>', '<Y>', '<OBJ number>'),
@@ -140,11 +250,40 @@ def parse_args(args=None):
                         default=1,
                         help='set debug verbose level[0-5]')
 
+    parser.add_argument('--crc-check', required=False,
+                        action='store_true',
+                        help='cross-check the table CRC engine against the reference algorithm')
+
     parser.add_argument('-o', '--output',
                         type=int,
                         choices=(1,2),
                         default=None,
                         help='set the output format (default: keep xcfg input version except V2->V1, raw outputs V1; 1: force V1 format; 2: use higher/original version when available)')
+
+    parser.add_argument('--cache', required=False,
+                        default=ResultCache.DEFAULT_FILE,
+                        metavar='FILE',
+                        help='result cache keyed by xcfg content, unchanged files are not parsed again')
+
+    parser.add_argument('--no-cache', required=False,
+                        action='store_true',
+                        help='neither read nor update the result cache')
+
+    parser.add_argument('--watch', required=False,
+                        default='',
+                        metavar='DIR',
+                        help='stay resident and rebuild xcfg files under DIR whenever they change')
+
+    parser.add_argument('--interval', required=False,
+                        type=float,
+                        default=1.0,
+                        help='--watch polling interval in seconds')
+
+    parser.add_argument('--watch-cache', required=False,
+                        type=int,
+                        default=256,
+                        metavar='MB',
+                        help='--watch memory bound for parsed configs kept for reuse')
     return parser
 
 cmd = None
@@ -0,0 +1,265 @@
+import os
+import time
+import collections
+
+import config_parser as mcp
+from resultcache import ResultCache
+from verbose import VerboseMessage as v
+
+class ModelCache(object):
+    """LRU of parsed XcfgConfigParser models bounded by the total source file bytes."""
+
+    def __init__(self, max_bytes=256 << 20):
+        """Create an empty cache.
+
+        Input:
+            max_bytes: Upper bound of the summed source sizes of the cached models.
+        Output:
+            None.
+        """
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.items = collections.OrderedDict()  # path -> (digest, size, model)
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, path, digest):
+        """Return the cached model of path when its content digest still matches, else None."""
+        item = self.items.get(path)
+        if item is None or item[0] != digest:
+            return None
+
+        self.items.move_to_end(path)
+        return item[2]
+
+    def put(self, path, digest, size, model):
+        """Insert or replace a model and evict the least recently used beyond max_bytes.
+
+        Input:
+            path: Source file path.
+            digest: Content digest of the source file.
+            size: Source file size in bytes, used as the model weight.
+            model: Parsed XcfgConfigParser.
+        Output:
+            None. The newest model is always kept, even when larger than max_bytes.
+        """
+        self.pop(path)
+        self.items[path] = (digest, size, model)
+        self.total += size
+
+        while self.total > self.max_bytes and len(self.items) > 1:
+            _, (_, old_size, _) = self.items.popitem(last=False)
+            self.total -= old_size
+
+    def pop(self, path):
+        """Drop the model of path if cached."""
+        item = self.items.pop(path, None)
+        if item is not None:
+            self.total -= item[1]
+
+class ConfigWatcher(object):
+    """Poll a directory tree and rebuild changed xcfg files with a resident header DB.
+
+    Changed xcfg files are parsed, saved and optionally exported to raw; changed
+    raw files are merged into the header DB, keeping the DB row on a conflict;
+    a changed DB CSV is reloaded. Parsed models stay in a ModelCache, so a
+    touched-but-unchanged file is not parsed again and a DB reload only
+    regenerates the raw output.
+    """
+
+    EXTENSIONS = ('xcfg', 'raw')
+
+    def __init__(self, root, output=None, raw=False, stream=False, database=None, interval=1.0, max_bytes=256 << 20):
+        """Configure the watcher.
+
+        Input:
+            root: Directory to watch recursively.
+            output: CLI output selector or None.
+            raw: Whether to generate raw files as well.
+            stream: Whether to parse xcfg files in stream mode.
+            database: Header DB path, CSV or binary '.xdb'.
+            interval: Polling interval in seconds.
+            max_bytes: ModelCache size bound.
+        Output:
+            None.
+        """
+        self.root = root
+        self.output = output
+        self.raw = raw
+        self.stream = stream
+        self.database = database
+        self.interval = interval
+        self.models = ModelCache(max_bytes)
+        self.scanner = None
+        self.db = None
+        self.db_stat = None
+        self.db_generation = 0
+        self.files = {}
+        self.processed = {}     # path -> db_generation used for its raw output
+
+        # nobody is there to answer a MATRIX_X/Y or header conflict prompt
+        mcp.XcfgBuildRawFile.interactive = False
+        mcp.RawConfigScanner.interactive = False
+
+    def stat_key(self, path):
+        """Return the (mtime_ns, size) change signature of a file, or None when missing."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        return (st.st_mtime_ns, st.st_size)
+
+    def snapshot(self):
+        """Return {path: stat_key} of the watched source files, rebuilt outputs excluded."""
+        files = {}
+        for root, dirs, names in os.walk(self.root):
+            for name in names:
+                if name.rsplit('.', 1)[-1].lower() not in self.EXTENSIONS or '.rebuild(' in name:
+                    continue
+
+                path = os.path.join(root, name)
+                key = self.stat_key(path)
+                if key is not None:
+                    files[path] = key
+
+        return files
+
+    def reload_db(self, force=False):
+        """Load the header DB file again when it changed on disk.
+
+        Input:
+            force: Reload even when the file signature is unchanged.
+        Output:
+            True when a new DB was loaded.
+        """
+        if not (self.raw and self.database):
+            return False
+
+        key = self.stat_key(self.database)
+        if key is None or (key == self.db_stat and not force):
+            return False
+
+        db = mcp.load_header_db(self.database)
+        self.db_stat = key
+        if db is None:
+            return False
+
+        # keep the scanner merging into the current DB
+        if self.scanner is not None:
+            self.scanner.load(self.database)
+
+        self.db = db
+        self.db_generation += 1
+        v.msg(v.CONST, 'Load db file: {:s} ({:d} rows)'.format(self.database, len(db)))
+
+        return True
+
+    def scan_raw(self):
+        """Merge the headers of the raw files under root into the DB and save it."""
+        if self.scanner is None:
+            self.scanner = mcp.RawConfigScanner()
+            if self.database:
+                self.scanner.db_file = self.database
+                if os.path.exists(self.database):
+                    self.scanner.load()
+
+        try:
+            self.db = mcp.HeaderIndex.from_frame(self.scanner.scan(self.root))
+            self.scanner.save()
+        except Exception as e:
+            v.msg(v.ERR, 'Scan raw files failed: {:s}'.format(str(e)))
+            return
+
+        # the save above is our own write, no need to reload it
+        if self.database:
+            self.db_stat = self.stat_key(self.database)
+        self.db_generation += 1
+
+    def process(self, path):
+        """Rebuild one xcfg file, reusing its cached model when the content is unchanged.
+
+        Input:
+            path: xcfg file path.
+        Output:
+            None. Prints the CRC result and the written outputs.
+        """
+        try:
+            digest = ResultCache.file_hash(path)
+            xcfg = self.models.get(path, digest)
+            if xcfg is None:
+                xcfg = mcp.XcfgConfigParser()
+                xcfg.load(path, stream=self.stream)
+                xcfg.save(self.output)
+                self.models.put(path, digest, os.path.getsize(path), xcfg)
+            elif self.processed.get(path) == self.db_generation or not self.raw:
+                v.msg(v.INFO, 'Unchanged content: {:s}'.format(path))
+                return
+
+            if self.raw:
+                builder = mcp.XcfgBuildRawFile(xcfg)
+                builder.load_db(self.db)
+                builder.rebuild_raw_data(self.output)
+                builder.save_raw_file(self.output)
+
+            self.processed[path] = self.db_generation
+        except Exception as e:
+            v.msg(v.ERR, 'Process failed: {:s}, Error = {:s}'.format(path, str(e)))
+
+    def poll(self):
+        """Run one polling cycle.
+
+        Input:
+            None.
+        Output:
+            Number of changed files handled.
+
+        Key steps:
+            1. Reload the DB CSV when it changed.
+            2. Merge changed raw files into the DB.
+            3. Rebuild changed xcfg files, or all cached ones after a DB change.
+        """
+        files = self.snapshot()
+        changed = [path for path, key in files.items() if self.files.get(path) != key]
+        for path in set(self.files) - set(files):
+            self.models.pop(path)
+            self.processed.pop(path, None)
+        self.files = files
+
+        generation = self.db_generation
+        self.reload_db()
+
+        if any(path.lower().endswith('.raw') for path in changed):
+            self.scan_raw()
+
+        xcfgs = [path for path in changed if path.lower().endswith('.xcfg')]
+        if self.raw and self.db_generation != generation:
+            # a new DB may resolve MATRIX_X/Y differently, refresh the raw outputs
+            xcfgs.extend(path for path in self.models.items if path not in xcfgs)
+
+        for path in sorted(xcfgs):
+            self.process(path)
+
+        return len(changed)
+
+    def run(self, cycles=None):
+        """Poll until interrupted (Ctrl-C) or for a number of cycles.
+
+        Input:
+            cycles: Optional number of polling cycles, None runs forever.
+        Output:
+            None.
+        """
+        self.reload_db(force=True)
+        self.files = self.snapshot()
+        v.msg(v.CONST, 'Watching {:s} ({:d} files), Ctrl-C to stop'.format(self.root, len(self.files)))
+
+        try:
+            while cycles is None or cycles > 0:
+                time.sleep(self.interval)
+                self.poll()
+                if cycles is not None:
+                    cycles -= 1
+        except KeyboardInterrupt:
+            v.msg(v.CONST, 'Stop watching {:s}'.format(self.root))